@@ -10,30 +10,50 @@ Usage:
 Output:
     - dist/protocol_parser.exe (Windows)
     - dist/protocol_parser (macOS/Linux)
+
+If UPX (https://upx.github.io) is on PATH it is used to compress the bundled
+libraries, which shrinks the executable and shortens --onefile start-up.
 """
 
 import os
 import sys
 import subprocess
 import platform
+import shutil
+from importlib.util import find_spec
+
+# pip package name -> import name, where they differ
+IMPORT_NAMES = {'pyinstaller': 'PyInstaller', 'pyserial': 'serial'}
+
+SYSTEM = platform.system()
 
 def check_dependencies():
     """Check and install required dependencies."""
     dependencies = ['pyinstaller', 'pandas', 'numpy', 'pyserial', 'openpyxl']
     
-    print("Checking dependencies...")
+    messages = ["Checking dependencies..."]
+    missing = []
     for package in dependencies:
+        # find_spec only locates the module, it does not import it
+        if find_spec(IMPORT_NAMES.get(package, package)) is not None:
+            messages.append(f"✓ {package} is installed")
+        else:
+            messages.append(f"✗ {package} not found")
+            missing.append(package)
+    
+    # The probes are instant, so report them in one write; install progress
+    # below is still printed as it happens
+    sys.stdout.write('\n'.join(messages) + '\n')
+    
+    # Install everything that is missing in a single pip run
+    if missing:
+        print(f"Installing: {' '.join(missing)}")
         try:
-            __import__(package)
-            print(f"✓ {package} is installed")
-        except ImportError:
-            print(f"✗ {package} not found. Installing...")
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-                print(f"✓ {package} installed successfully")
-            except subprocess.CalledProcessError as e:
-                print(f"✗ Failed to install {package}: {e}")
-                return False
+            subprocess.check_call([sys.executable, "-m", "pip", "install", *missing])
+            print(f"✓ {', '.join(missing)} installed successfully")
+        except subprocess.CalledProcessError as e:
+            print(f"✗ Failed to install {', '.join(missing)}: {e}")
+            return False
     
     print("\nAll dependencies satisfied!\n")
     return True
@@ -54,15 +74,22 @@ def create_executable(script_name='protocol_parser.py'):
     # Get additional files that need to be included
     additional_files = []
     
+    # One directory listing covers all the optional sibling files below
+    cwd_files = set(os.listdir('.'))
+    
     # Include lcfunc.py and light_controller_parser.py
-    if os.path.exists('lcfunc.py'):
+    if 'lcfunc.py' in cwd_files:
         additional_files.append('lcfunc.py')
-    if os.path.exists('light_controller_parser.py'):
+    if 'light_controller_parser.py' in cwd_files:
         additional_files.append('light_controller_parser.py')
     
     # Build PyInstaller command
+    # Run PyInstaller from this interpreter instead of resolving it on PATH.
+    # -OO makes PyInstaller compile the bundled modules with docstrings and
+    # asserts stripped (openpyxl and pandas carry large docstrings), which
+    # shrinks the archive that --onefile unpacks on every launch.
     command = [
-        'pyinstaller',
+        sys.executable, '-OO', '-m', 'PyInstaller',
         '--onefile',                    # Create single executable
         '--windowed',                   # No console window (remove for debugging)
         '--name=LightController',       # Executable name
@@ -89,12 +116,49 @@ def create_executable(script_name='protocol_parser.py'):
     for module in hidden_imports:
         command.extend(['--hidden-import', module])
     
+    # Exclude large packages that get pulled in transitively but are never used.
+    # A smaller bundle also means less to unpack on every --onefile launch
+    # (--onedir avoids that extraction entirely, at the cost of a folder of files).
+    excluded_modules = [
+        'matplotlib',
+        'scipy',
+        'IPython',
+        'jupyter',
+        'notebook',
+        'pytest',
+        'sphinx',
+        'PIL',
+        'PyQt5',
+        'PyQt6',
+        'PySide2',
+        'PySide6',
+        'setuptools',
+        'pip',
+        'wheel',
+        'tests',
+    ]
+    
+    for module in excluded_modules:
+        command.extend(['--exclude-module', module])
+    
+    # Compress with UPX when available; it is known to corrupt the MSVC runtime
+    # and the Python DLL, so leave those alone
+    upx_path = shutil.which('upx')
+    if upx_path:
+        command.extend(['--upx-dir', os.path.dirname(upx_path)])
+        for dll in ['vcruntime140.dll', 'python3.dll', f'python3{sys.version_info.minor}.dll']:
+            command.extend(['--upx-exclude', dll])
+    
+    # Strip debug symbols from bundled binaries (not supported on Windows)
+    if SYSTEM != "Windows":
+        command.append('--strip')
+    
     # Add additional Python files as data
     for file in additional_files:
         command.extend(['--add-data', f'{file}{os.pathsep}.'])
     
     # Add icon if exists (optional)
-    if os.path.exists('icon.ico'):
+    if 'icon.ico' in cwd_files:
         command.extend(['--icon', 'icon.ico'])
     
     # Add the main script
@@ -110,8 +174,7 @@ def create_executable(script_name='protocol_parser.py'):
         result = subprocess.run(command, check=True)
         
         # Success message
-        system = platform.system()
-        if system == "Windows":
+        if SYSTEM == "Windows":
             executable_path = os.path.join('dist', 'LightController.exe')
         else:
             executable_path = os.path.join('dist', 'LightController')
@@ -121,7 +184,7 @@ def create_executable(script_name='protocol_parser.py'):
         print("="*60)
         print(f"\nLocation: {os.path.abspath(executable_path)}")
         print(f"\nTo run:")
-        if system == "Windows":
+        if SYSTEM == "Windows":
             print(f"  {executable_path}")
         else:
             print(f"  ./{executable_path}")
@@ -140,8 +203,6 @@ def create_executable(script_name='protocol_parser.py'):
 
 def clean_build_files():
     """Clean up PyInstaller build files."""
-    import shutil
-    
     dirs_to_remove = ['build', '__pycache__']
     files_to_remove = ['LightController.spec']
     
@@ -170,7 +231,7 @@ if __name__ == "__main__":
         sys.exit(1)
     
     print(f"Python version: {sys.version}")
-    print(f"Platform: {platform.system()} {platform.machine()}")
+    print(f"Platform: {SYSTEM} {platform.machine()}")
     print()
     
     # Check and install dependencies
@@ -3,27 +3,223 @@
 import serial
 import serial.tools.list_ports
 import platform
+import sys
 import datetime
 import time
 import os
-import numpy as np
-import pandas as pd
 import re
-import threading
-import ast
-import json
-import hashlib
 
 
 from collections import defaultdict
+from functools import lru_cache
+
+# the OS cannot change while the process runs, so it is looked up once
+_CURRENT_OS = platform.system()
+_IS_WINDOWS = _CURRENT_OS == 'Windows'
+
+# USB-serial chips commonly found on Arduino boards and clones; add new chip
+# names here, they all end up in one alternation that is scanned once per string
+_ARDUINO_CHIPS = ('FTDI', 'CH340', 'CP210', 'wch.cn')
+_ARDUINO_CHIP_PATTERN = '|'.join(map(re.escape, _ARDUINO_CHIPS))
+
+@lru_cache(maxsize=None)
+def _manufacturer_matcher(search_term):
+    '''compile one regex that finds the search term and the known chip names
+    in a single scan; each match reports which kind it is via lastgroup
+    ('board' or 'chip'). Compiled once per search term.'''
+    return re.compile(r'(?P<board>%s)|(?P<chip>(?i:%s))' % (re.escape(search_term), _ARDUINO_CHIP_PATTERN))
+
+# Port enumeration can take seconds on Windows (e.g. with paired Bluetooth
+# serial devices), so results are reused for a short time
+_PORT_CACHE = {'ts': 0.0, 'ports': None}
+_PORT_CACHE_TTL = 2.0  # seconds
+
+def _cached_comports():
+    '''return the list of serial ports, rescanning at most once per _PORT_CACHE_TTL'''
+    now = time.monotonic()
+    if _PORT_CACHE['ports'] is None or now - _PORT_CACHE['ts'] >= _PORT_CACHE_TTL:
+        _PORT_CACHE['ports'] = list(serial.tools.list_ports.comports())
+        _PORT_CACHE['ts'] = now
+    return _PORT_CACHE['ports']
+
+def invalidate_port_cache():
+    '''force the next port lookup to rescan, e.g. after a board is re-plugged'''
+    _PORT_CACHE['ports'] = None
+    invalidate_uid_cache()
+
+# board IDs from get_arduino_unique_id, keyed by port name, each stored with
+# the identity (serial number, VID, PID, location) of the board it was made for
+_UID_CACHE = {}
+
+def invalidate_uid_cache():
+    '''forget the board IDs computed so far (a different board may now sit on a port)'''
+    _UID_CACHE.clear()
+
+def _set_low_latency(ser):
+    '''reduce the USB-serial receive latency of an open port (best effort)
+
+    FTDI/CH340 adapters buffer incoming data for up to 16 ms by default, which
+    adds to every command/response round-trip. Failures (missing permissions,
+    unsupported driver) are ignored and the port keeps its default settings.
+    '''
+    if _CURRENT_OS == 'Linux':
+        # FTDI latency timer, exposed by the ftdi_sio driver
+        try:
+            name = os.path.basename(ser.port)
+            with open(f'/sys/bus/usb-serial/devices/{name}/latency_timer', 'w') as f:
+                f.write('1')
+        except OSError:
+            pass
+        # ASYNC_LOW_LATENCY flag via TIOCGSERIAL/TIOCSSERIAL
+        try:
+            ser.set_low_latency_mode(True)
+        except (AttributeError, OSError, ValueError):
+            pass
+    elif _CURRENT_OS == 'Darwin':
+        # IOSSDATALAT: receive latency in microseconds
+        try:
+            import fcntl
+            import struct
+            IOSSDATALAT = 0x80085400
+            fcntl.ioctl(ser.fileno(), IOSSDATALAT, struct.pack('L', 1))
+        except (AttributeError, OSError, ValueError):
+            pass
+
+def _wait_for_board_ready(ser, total_timeout=6.0):
+    '''wait until the board reports it has finished setup()
+
+    The firmware prints "READY" at the end of setup(), so the wait ends as soon
+    as the board is up instead of always sleeping for the worst case. Opening
+    the port already resets boards with DTR auto-reset, so no extra reset is
+    triggered here. Older firmware without the banner simply waits for the
+    full timeout. Returns True if the banner was seen.
+    '''
+    # Block in the driver for each line instead of polling in_waiting
+    deadline = time.perf_counter() + total_timeout
+    while time.perf_counter() < deadline:
+        t_line, line = _read_line_timed(ser, deadline - time.perf_counter())
+        if t_line is None:
+            break
+        if b'READY' in line:
+            return True
+    return False
+
+# KEY:value fields of a "Salve;PATTERN_LENGTH:4;..." or "MEMORY;FREE:123;..."
+# reply. Each field starts after a ';', so the leading reply name is skipped,
+# and the value runs to the next ';' (it may itself contain ':')
+_KV_RE = re.compile(r';([^;:]*):([^;]*)')
+
+# Fixed handshake messages, encoded once
+_GREETING = b'Hello\n'
+_BYE = b'Bye\n'
+
+def _read_line_timed(ser, timeout):
+    '''block until a line arrives or timeout seconds pass
+
+    Waits inside the serial driver (select/WaitCommEvent) instead of polling
+    in_waiting with sleeps, so the caller burns no CPU while idle and does not
+    compete with the countdown thread for the GIL. The arrival time is taken
+    when the first byte comes in, same as the polling loops did, from
+    time.perf_counter() so an NTP adjustment mid-calibration cannot skew it.
+    Returns (arrival time, raw line) or (None, b'') on timeout.
+    '''
+    saved_timeout = ser.timeout
+    ser.timeout = max(timeout, 0)
+    try:
+        first = ser.read(1)
+        if not first:
+            return None, b''
+        t_arrival = time.perf_counter()
+        if first == b'\n':  # empty line; readline() would swallow the next one
+            return t_arrival, first
+        return t_arrival, first + ser.readline()
+    finally:
+        ser.timeout = saved_timeout
+
+def _windows_port_matcher(board_type, search_term):
+    '''build the port matching rule used on Windows'''
+    mfr_re = _manufacturer_matcher(search_term)
+    def match(port_name, desc, mfr):
+        # Windows 11 fix: Check both description AND manufacturer fields
+        # Many Arduino clones or CH340-based boards show "USB-SERIAL CH340" in description
+        # but have "Arduino" or chip manufacturer in the manufacturer field
+        hits = {m.lastgroup for m in mfr_re.finditer(mfr)}
+        if board_type in desc or 'board' in hits:
+            return True
+        # Also check for common Arduino USB chip manufacturers
+        if 'chip' in hits:
+            print(f'  Note: Found potential Arduino with {mfr} chipset on {port_name}')
+            return True
+        return False
+    return match
+
+def _unix_port_matcher(board_type, search_term):
+    '''build the port matching rule used on macOS and Linux'''
+    if board_type != 'Arduino':
+        search_term = 'Arduino'
+        print('Detailed Arduino board cannot be recognized on Mac or Linux. Searching for all "Arduino" boards.')
+    def match(port_name, desc, mfr):
+        return search_term in mfr
+    return match
+
+def _no_port_matcher(board_type, search_term):
+    '''unsupported OS: no port is detected automatically'''
+    return lambda port_name, desc, mfr: False
+
+_PORT_MATCHERS = {
+    'Windows': _windows_port_matcher,
+    'Darwin': _unix_port_matcher,
+    'Linux': _unix_port_matcher,
+}
+
+def _open_board(port, kwargs):
+    '''open `port`, lower its latency and wait for the board to finish booting'''
+    ser = serial.Serial(port=port, **kwargs)
+    # a (re)opened port may have a different board behind it
+    _UID_CACHE.pop(port, None)
+    _set_low_latency(ser)
+    # Longer wait time for all boards, especially Arduino Due Native USB
+    # Native USB needs more time for enumeration
+    _wait_for_board_ready(ser)
+    return ser
+
+def _prompt_port_choice(port_list, exit_key, exit_word):
+    '''ask for a port number until a valid one is entered
+
+    Returns the 0-based index into port_list, or None if the user typed exit_key.
+    '''
+    while True:
+        choice = input(f'\nEnter port number (1-{len(port_list)}) or "{exit_key}" to {exit_word}: ')
+        if choice.lower() == exit_key:
+            return None
+        try:
+            choice_idx = int(choice) - 1
+        except ValueError:
+            print(f'\033[31mInvalid input. Please enter a number or "{exit_key}" to {exit_word}.\033[0m')
+            continue
+        if 0 <= choice_idx < len(port_list):
+            return choice_idx
+        print(f'\033[31mInvalid choice. Please enter a number between 1 and {len(port_list)}.\033[0m')
+
+def _open_selected_port(port, kwargs):
+    '''open a manually selected port, reporting progress'''
+    print(f'\nSelected port: {port}')
+    print('\nBuilding serial connection...')
+    print('Waiting for board initialization...')
+    return _open_board(port, kwargs)
 
 # functions
-def SetUpSerialPort(board_type='Arduino Uno', **kwargs):
+def SetUpSerialPort(board_type='Arduino Uno', max_ports=1024, **kwargs):
     # modified from LoomingFunc.py
-    current_os = platform.system()
+    # max_ports bounds the scan (Windows can report tens of thousands of
+    # virtual Bluetooth COM ports); pass max_ports=0 to scan every port
+    current_os = _CURRENT_OS
     Port = ''
-    port_list = list(serial.tools.list_ports.comports())
-    port_names = [None]*len(port_list)
+    port_list = _cached_comports()
+    if max_ports and len(port_list) > max_ports:
+        print(f'\033[33mWarning: {len(port_list)} serial ports found, only the first {max_ports} are scanned. '
+              f'Use max_ports=0 to scan all of them.\033[0m')
+        port_list = port_list[:max_ports]
     port_num = 0
     ser = ''
     
@@ -32,104 +228,55 @@ def SetUpSerialPort(board_type='Arduino Uno', **kwargs):
     
     print(f'\nSearching for {board_type} on {current_os}...')
     print('Available ports:')
-    for port in port_list:
-        print(f'  - {port.device}: {port.description} (Manufacturer: {port.manufacturer})')
+    # one write for the whole listing instead of a print per port
+    sys.stdout.write(''.join(f'  - {port.device}: {port.description} (Manufacturer: {port.manufacturer})\n'
+                             for port in port_list))
+    
+    # the OS-specific matching rule is chosen once, outside the port loop
+    match_port = _PORT_MATCHERS.get(current_os, _no_port_matcher)(board_type, search_term)
     
-    for i, port in enumerate(port_list):
+    for port in port_list:
         port_name = port.device
-        port_names[i] = port_name
-        found = False
-        
-        if current_os == 'Windows':
-            # Windows 11 fix: Check both description AND manufacturer fields
-            # Many Arduino clones or CH340-based boards show "USB-SERIAL CH340" in description
-            # but have "Arduino" or chip manufacturer in the manufacturer field
-            if port.description and port.description.find(board_type) != -1:
-                found = True
-            elif port.manufacturer and port.manufacturer.find(search_term) != -1:
-                found = True
-            # Also check for common Arduino USB chip manufacturers
-            elif port.manufacturer and any(chip in port.manufacturer for chip in ['FTDI', 'CH340', 'CP210', 'wch.cn']):
-                print(f'  Note: Found potential Arduino with {port.manufacturer} chipset on {port_name}')
-                found = True
-            
-            if found:
-                port_num += 1
-                Port = port_name
-                
-        elif current_os == 'Darwin' or current_os == 'Linux':
-            if board_type != 'Arduino':
-                search_term = 'Arduino'
-                print('Detailed Arduino board cannot be recognized on Mac or Linux. Searching for all "Arduino" boards.')
-            if port.manufacturer != None and port.manufacturer.find(search_term) != -1:
-                port_num += 1
-                Port = port_name
+        if match_port(port_name, port.description or '', port.manufacturer or ''):
+            port_num += 1
+            Port = port_name
                 
     if port_num == 1:
         print('\n{} is found on {}'.format(board_type,Port))
+        # The port is only opened once the user confirms: opening it pulses
+        # DTR and resets the board, which must not happen if they decline
         answer = input('\nDo you confirm using this port? (Y/n): ')
         if not (answer == 'Y' or answer == 'y'):
             raise ValueError('Port is not confirmed.')
         print('\nBuilding serial connection...')
-        ser = serial.Serial(port=Port,**kwargs)
-        # Longer wait time for all boards, especially Arduino Due Native USB
-        # Native USB needs more time for enumeration
         print('Waiting for board initialization...')
-        time.sleep(6)
+        ser = _open_board(Port, kwargs)
     elif port_num > 1:
         print(f'\n\033[33mMore than one {board_type} is connected.\033[0m')
         print('Please select the correct port manually:')
-        for i, port in enumerate(port_list):
-            print(f'  [{i+1}] {port.device}: {port.description} (Manufacturer: {port.manufacturer})')
-        
-        while True:
-            try:
-                choice = input(f'\nEnter port number (1-{len(port_list)}) or "q" to quit: ')
-                if choice.lower() == 'q':
-                    raise ValueError('Port selection cancelled by user.')
-                choice_idx = int(choice) - 1
-                if 0 <= choice_idx < len(port_list):
-                    Port = port_list[choice_idx].device
-                    print(f'\nSelected port: {Port}')
-                    print('\nBuilding serial connection...')
-                    ser = serial.Serial(port=Port,**kwargs)
-                    # Longer wait time for all boards, especially Native USB
-                    print('Waiting for board initialization...')
-                    time.sleep(6)
-                    break
-                else:
-                    print(f'\033[31mInvalid choice. Please enter a number between 1 and {len(port_list)}.\033[0m')
-            except ValueError as e:
-                if 'cancelled' in str(e):
-                    raise
-                print('\033[31mInvalid input. Please enter a number or "q" to quit.\033[0m')
+        # Candidates are deliberately not probed to find the right board:
+        # opening a port pulses DTR and resets the board, which would abort a
+        # protocol already running on another Arduino. Only the chosen port
+        # is opened, so there is a single boot wait whatever the port count.
+        sys.stdout.write(''.join(f'  [{i+1}] {port.device}: {port.description} (Manufacturer: {port.manufacturer})\n'
+                                 for i, port in enumerate(port_list)))
+        
+        choice_idx = _prompt_port_choice(port_list, 'q', 'quit')
+        if choice_idx is None:
+            raise ValueError('Port selection cancelled by user.')
+        ser = _open_selected_port(port_list[choice_idx].device, kwargs)
     else:
         print('\n\033[33mNo {} detected automatically.\033[0m'.format(board_type))
         if len(port_list) > 0:
             print('Would you like to manually select a port? Available ports:')
-            for i, port in enumerate(port_list):
-                print(f'  [{i+1}] {port.device}: {port.description} (Manufacturer: {port.manufacturer})')
+            sys.stdout.write(''.join(f'  [{i+1}] {port.device}: {port.description} (Manufacturer: {port.manufacturer})\n'
+                                     for i, port in enumerate(port_list)))
             
-            while True:
-                try:
-                    choice = input(f'\nEnter port number (1-{len(port_list)}) or "n" to skip: ')
-                    if choice.lower() == 'n':
-                        print('\n\033[33mSerial communication is unavailable.\033[0m\n')
-                        break
-                    choice_idx = int(choice) - 1
-                    if 0 <= choice_idx < len(port_list):
-                        Port = port_list[choice_idx].device
-                        print(f'\nSelected port: {Port}')
-                        print('\nBuilding serial connection...')
-                        ser = serial.Serial(port=Port,**kwargs)
-                        # Longer wait time for all boards, especially Native USB
-                        print('Waiting for board initialization...')
-                        time.sleep(6)
-                        break
-                    else:
-                        print(f'\033[31mInvalid choice. Please enter a number between 1 and {len(port_list)}.\033[0m')
-                except ValueError as e:
-                    print('\033[31mInvalid input. Please enter a number or "n" to skip.\033[0m')
+            choice_idx = _prompt_port_choice(port_list, 'n', 'skip')
+            if choice_idx is None:
+                print('\n\033[33mSerial communication is unavailable.\033[0m\n')
+            else:
+                ser = _open_selected_port(port_list[choice_idx].device, kwargs)
         else:
             print('\033[33mNo serial ports available. Serial communication is unavailable.\033[0m\n')
     return ser
@@ -140,11 +287,17 @@ def ClearSerialBuffer(ser, print_flag = False):
     if not ser:
         return
     else:
-        lineNum = 0
-        while ser.inWaiting() > 0:
-            fb = ser.readline().decode('utf-8').strip()
-            lineNum += 1
-            print(f'\033[30mCleared serial buffer -- line {lineNum}: {fb}\033[0m')
+        # drain everything pending in bulk reads, then split into lines in memory
+        data = b''
+        while ser.in_waiting > 0:
+            data += ser.read(ser.in_waiting)
+        lines = data.splitlines()
+        lineNum = len(lines)
+        # only decode the drained lines when they are going to be shown
+        if print_flag:
+            for i, line in enumerate(lines, start=1):
+                fb = line.decode('utf-8', errors='replace').strip()
+                print(f'\033[30mCleared serial buffer -- line {i}: {fb}\033[0m')
         if lineNum == 0 and print_flag:
             print('No info in serial buffer.')
         return 0
@@ -153,6 +306,17 @@ def ClearSerialBuffer(ser, print_flag = False):
 # Calibration Database Management
 # ============================================================================
 
+def _board_id_hash(unique_string):
+    '''hash a board description into the 16-character ID used as database key
+
+    The IDs are stored as keys in calibration_database.json, so the algorithm
+    must stay MD5 (truncated): a different hash would orphan every saved
+    calibration. It is not used for security, and it runs twice per session.
+    '''
+    # hashlib is only needed here, so it is imported on first use
+    import hashlib
+    return hashlib.md5(unique_string.encode()).hexdigest()[:16]
+
 def get_arduino_unique_id(ser):
     """
     Get a unique identifier for the connected Arduino board.
@@ -179,8 +343,9 @@ def get_arduino_unique_id(ser):
     try:
         port_name = ser.port
         
-        # Get detailed port information
-        port_list = list(serial.tools.list_ports.comports())
+        # Get detailed port information (shares the short-lived enumeration
+        # cache with SetUpSerialPort, so no second scan right after connecting)
+        port_list = _cached_comports()
         board_info = {
             'port': port_name,
             'description': 'Unknown',
@@ -192,32 +357,29 @@ def get_arduino_unique_id(ser):
             'hwid': None
         }
         
-        for port in port_list:
-            # Match port device - normalize path for cross-platform compatibility
-            port_device = port.device
-            
-            # On Windows, COM port matching is case-insensitive
-            if platform.system() == 'Windows':
-                if port_device.upper() == port_name.upper():
-                    match_found = True
-                else:
-                    match_found = False
-            else:
-                # On Unix systems (macOS, Linux), case-sensitive matching
-                if port_device == port_name:
-                    match_found = True
-                else:
-                    match_found = False
-            
-            if match_found:
-                board_info['description'] = port.description or 'Unknown'
-                board_info['manufacturer'] = port.manufacturer or 'Unknown'
-                board_info['serial_number'] = port.serial_number
-                board_info['vid'] = port.vid
-                board_info['pid'] = port.pid
-                board_info['location'] = getattr(port, 'location', None)
-                board_info['hwid'] = port.hwid if hasattr(port, 'hwid') else None
-                break
+        # Index ports by device name; on Windows, COM port names are
+        # case-insensitive, on Unix systems (macOS, Linux) they are not
+        port_map = {(p.device.upper() if _IS_WINDOWS else p.device): p for p in port_list}
+        port = port_map.get(port_name.upper() if _IS_WINDOWS else port_name)
+        
+        # save after load in one session asks again for the same port; the
+        # cached ID is only reused while the same board is on that port
+        # (ports such as /dev/ttyACM0 are reused for whatever is plugged in)
+        fingerprint = None
+        if port is not None:
+            fingerprint = (port.serial_number, port.vid, port.pid, getattr(port, 'location', None))
+        cached = _UID_CACHE.get(port_name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        if port is not None:
+            board_info['description'] = port.description or 'Unknown'
+            board_info['manufacturer'] = port.manufacturer or 'Unknown'
+            board_info['serial_number'] = port.serial_number
+            board_info['vid'] = port.vid
+            board_info['pid'] = port.pid
+            board_info['location'] = getattr(port, 'location', None)
+            board_info['hwid'] = port.hwid if hasattr(port, 'hwid') else None
         
         # Create unique ID from available information
         # Priority: serial_number > (vid, pid) > (vid, pid, port) > port
@@ -230,26 +392,29 @@ def get_arduino_unique_id(ser):
         elif board_info['vid'] and board_info['pid']:
             # Acceptable: Use VID:PID + port (changes if port changes)
             # Normalize port name for consistency
-            normalized_port = port_name.upper() if platform.system() == 'Windows' else port_name
+            normalized_port = port_name.upper() if _IS_WINDOWS else port_name
             unique_string = f"{board_info['vid']}:{board_info['pid']}:{normalized_port}"
         else:
             # Fallback: Use port + description (least reliable)
-            normalized_port = port_name.upper() if platform.system() == 'Windows' else port_name
+            normalized_port = port_name.upper() if _IS_WINDOWS else port_name
             unique_string = f"{normalized_port}:{board_info['description']}"
         
         # Create hash for consistent ID (16 characters for readability)
-        unique_id = hashlib.md5(unique_string.encode()).hexdigest()[:16]
+        unique_id = _board_id_hash(unique_string)
         
+        _UID_CACHE[port_name] = (fingerprint, (unique_id, board_info))
         return unique_id, board_info
         
     except Exception as e:
         print(f'\033[33mWarning: Could not get Arduino unique ID: {e}\033[0m')
-        import traceback
-        traceback.print_exc()
+        # the warning is enough normally; set LC_DEBUG=1 to see the full stack
+        if os.environ.get('LC_DEBUG'):
+            import traceback
+            traceback.print_exc()
         # Fallback to port name only
         try:
-            normalized_port = ser.port.upper() if platform.system() == 'Windows' else ser.port
-            unique_id = hashlib.md5(normalized_port.encode()).hexdigest()[:16]
+            normalized_port = ser.port.upper() if _IS_WINDOWS else ser.port
+            unique_id = _board_id_hash(normalized_port)
             return unique_id, {'port': ser.port, 'description': 'Unknown', 'manufacturer': 'Unknown', 'serial_number': None, 'vid': None, 'pid': None}
         except:
             # Ultimate fallback
@@ -257,26 +422,62 @@ def get_arduino_unique_id(ser):
 
 
 
+def _json_loads(data):
+    '''parse JSON bytes, with orjson when it is installed (optional, faster)'''
+    try:
+        import orjson
+    except ImportError:
+        import json
+        return json.loads(data)
+    return orjson.loads(data)
+
+def _json_dumps(obj):
+    '''serialize to indented JSON bytes, with orjson when it is installed'''
+    try:
+        import orjson
+    except ImportError:
+        import json
+        return json.dumps(obj, indent=2).encode('utf-8')
+    # calibration results are numpy floats, which orjson only takes with this option
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+# parsed calibration databases: absolute path -> ((mtime_ns, size), db)
+_DB_CACHE = {}
+
 def load_calibration_database(db_path='calibration_database.json'):
     """
     Load calibration database from JSON file.
     
+    The database is kept as a single JSON file on purpose: it holds one small
+    entry per board, is meant to be readable and editable by hand, and is
+    parsed at most once per change thanks to the in-memory cache.
+    
     Args:
         db_path: Path to calibration database file
         
     Returns:
         dict: Calibration database
     """
-    if os.path.exists(db_path):
-        try:
-            with open(db_path, 'r') as f:
-                db = json.load(f)
-            return db
-        except Exception as e:
-            print(f'\033[33mWarning: Could not load calibration database: {e}\033[0m')
-            print('Creating new database...')
-            return {}
-    else:
+    import copy
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return {}
+    # reuse the parsed database while the file is unchanged; callers get a
+    # copy so they can edit it before saving
+    key = os.path.abspath(db_path)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _DB_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+    try:
+        with open(db_path, 'rb') as f:
+            db = _json_loads(f.read())
+        _DB_CACHE[key] = (signature, db)
+        return copy.deepcopy(db)
+    except Exception as e:
+        print(f'\033[33mWarning: Could not load calibration database: {e}\033[0m')
+        print('Creating new database...')
         return {}
 
 
@@ -288,14 +489,39 @@ def save_calibration_database(db, db_path='calibration_database.json'):
         db: Calibration database dictionary
         db_path: Path to save database file
     """
+    import copy
+    key = os.path.abspath(db_path)
     try:
-        with open(db_path, 'w') as f:
-            json.dump(db, f, indent=2)
+        data = _json_dumps(db)
+        # write a temporary file and rename it over the database, so a crash
+        # mid-write never leaves a truncated file behind
+        tmp_path = db_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, db_path)
+        # the next load can use what was just written without re-reading it
+        st = os.stat(db_path)
+        _DB_CACHE[key] = ((st.st_mtime_ns, st.st_size), copy.deepcopy(db))
         print(f'\n✓ Calibration database saved to: {db_path}')
     except Exception as e:
+        _DB_CACHE.pop(key, None)
         print(f'\033[31mError: Could not save calibration database: {e}\033[0m')
 
 
+def _calibration_age_days(calib_data, now):
+    '''whole days since a calibration was saved; now is a time.time() value
+
+    Uses the stored epoch seconds; entries saved before they were recorded
+    fall back to parsing the timestamp string (may raise ValueError/KeyError).
+    '''
+    epoch = calib_data.get('timestamp_epoch')
+    if epoch is None:
+        epoch = time.mktime(time.strptime(calib_data['timestamp'], '%Y-%m-%d %H:%M:%S'))
+    return int((now - epoch) // 86400)
+
+
 def get_calibration_for_arduino(ser, db_path='calibration_database.json'):
     """
     Get stored calibration factor for the connected Arduino.
@@ -318,9 +544,7 @@ def get_calibration_for_arduino(ser, db_path='calibration_database.json'):
         
         # Check calibration age (3 months = 90 days)
         try:
-            calib_timestamp = datetime.datetime.strptime(calib_data["timestamp"], '%Y-%m-%d %H:%M:%S')
-            now = datetime.datetime.now()
-            age_days = (now - calib_timestamp).days
+            age_days = _calibration_age_days(calib_data, time.time())
             age_months = age_days / 30.44  # Average days per month
             
             # Check if calibration is older than 3 months
@@ -384,6 +608,9 @@ def get_calibration_for_arduino(ser, db_path='calibration_database.json'):
         return None
 
 
+# board_info fields kept in the calibration database
+_STORED_BOARD_INFO = ('port', 'description', 'manufacturer', 'serial_number')
+
 def save_calibration_for_arduino(ser, calib_result, method='v2', db_path='calibration_database.json'):
     """
     Save calibration result for the connected Arduino.
@@ -397,19 +624,18 @@ def save_calibration_for_arduino(ser, calib_result, method='v2', db_path='calibr
     unique_id, board_info = get_arduino_unique_id(ser)
     db = load_calibration_database(db_path)
     
-    # Store calibration data
+    # Store calibration data ('cost' is the offset key of older results)
+    offset = calib_result['offset'] if 'offset' in calib_result else calib_result.get('cost', 0)
+    # one clock reading for both the readable and the epoch timestamp
+    now = time.time()
     db[unique_id] = {
         'calib_factor': calib_result['calib_factor'],
-        'offset': calib_result.get('offset', calib_result.get('cost', 0)),
+        'offset': offset,
         'r_squared': calib_result.get('r_squared', None),
         'method': method,
-        'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'board_info': {
-            'port': board_info['port'],
-            'description': board_info['description'],
-            'manufacturer': board_info['manufacturer'],
-            'serial_number': board_info['serial_number']
-        }
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now)),
+        'timestamp_epoch': now,
+        'board_info': {key: board_info[key] for key in _STORED_BOARD_INFO},
     }
     
     save_calibration_database(db, db_path)
@@ -437,49 +663,51 @@ def list_all_calibrations(db_path='calibration_database.json'):
         print('\nNo calibrations stored in database.\n')
         return
     
-    now = datetime.datetime.now()
+    now = time.time()
+    # collect the report and write it out in one go
+    out = []
     expired_count = 0
     valid_count = 0
     
-    print(f'\n{"="*70}')
-    print(f'Stored Calibrations ({len(db)} boards)')
-    print(f'{"="*70}\n')
+    out.append(f'\n{"="*70}')
+    out.append(f'Stored Calibrations ({len(db)} boards)')
+    out.append(f'{"="*70}\n')
     
     for i, (board_id, data) in enumerate(db.items(), 1):
-        print(f'{i}. Board ID: {board_id}')
-        print(f'   Port: {data["board_info"]["port"]}')
-        print(f'   Description: {data["board_info"]["description"]}')
+        out.append(f'{i}. Board ID: {board_id}')
+        out.append(f'   Port: {data["board_info"]["port"]}')
+        out.append(f'   Description: {data["board_info"]["description"]}')
         if data["board_info"]["serial_number"]:
-            print(f'   Serial Number: {data["board_info"]["serial_number"]}')
-        print(f'   Calibration factor: {data["calib_factor"]:.6f}')
-        print(f'   Method: {data["method"]}')
-        print(f'   Last calibrated: {data["timestamp"]}')
+            out.append(f'   Serial Number: {data["board_info"]["serial_number"]}')
+        out.append(f'   Calibration factor: {data["calib_factor"]:.6f}')
+        out.append(f'   Method: {data["method"]}')
+        out.append(f'   Last calibrated: {data["timestamp"]}')
         
         # Calculate age and expiration status
         try:
-            calib_timestamp = datetime.datetime.strptime(data["timestamp"], '%Y-%m-%d %H:%M:%S')
-            age_days = (now - calib_timestamp).days
+            age_days = _calibration_age_days(data, now)
             age_months = age_days / 30.44
             
             if age_days > 90:
-                print(f'   Age: {age_days} days ({age_months:.1f} months) - ⚠️  EXPIRED (recalibration needed)')
+                out.append(f'   Age: {age_days} days ({age_months:.1f} months) - ⚠️  EXPIRED (recalibration needed)')
                 expired_count += 1
             else:
-                print(f'   Age: {age_days} days ({age_months:.1f} months) - ✓ Valid')
+                out.append(f'   Age: {age_days} days ({age_months:.1f} months) - ✓ Valid')
                 valid_count += 1
         except (ValueError, KeyError):
-            print(f'   Age: Unknown (timestamp parse error)')
+            out.append(f'   Age: Unknown (timestamp parse error)')
         
-        print()
+        out.append('')
     
     # Summary
-    print(f'{"="*70}')
-    print(f'Summary: {valid_count} valid, {expired_count} expired (>90 days)')
+    out.append(f'{"="*70}')
+    out.append(f'Summary: {valid_count} valid, {expired_count} expired (>90 days)')
     if expired_count > 0:
-        print(f'\n⚠️  {expired_count} board(s) need recalibration!')
-        print(f'Crystal oscillators drift over time. Recalibrate every 3 months')
-        print(f'for optimal timing accuracy.')
-    print(f'{"="*70}\n')
+        out.append(f'\n⚠️  {expired_count} board(s) need recalibration!')
+        out.append(f'Crystal oscillators drift over time. Recalibrate every 3 months')
+        out.append(f'for optimal timing accuracy.')
+    out.append(f'{"="*70}\n')
+    sys.stdout.write('\n'.join(out) + '\n')
 
 
 def delete_calibration(board_id=None, db_path='calibration_database.json'):
@@ -517,23 +745,17 @@ def delete_calibration(board_id=None, db_path='calibration_database.json'):
     
 def CheckEmptyDataInMiddle(protocol_df):
     # generated by GPT 4o
-    columns_with_empty_in_middle = []
-    
-    for col in protocol_df.columns:
-        data = protocol_df[col]
-        
-        first_non_null_idx = data.first_valid_index()
-        last_non_null_idx = data.last_valid_index()
-        
-        # if starts with nan values but has non-nan values in the middle
-        if first_non_null_idx != 0 and first_non_null_idx is not None:
-            columns_with_empty_in_middle.append(col)
-            continue
-        
-        # if nan values in the middle
-        if first_non_null_idx is not None and last_non_null_idx is not None:
-            if data[first_non_null_idx:last_non_null_idx].isnull().any():
-                columns_with_empty_in_middle.append(col)
+    # A column is fine if its values form one block from the first row down,
+    # optionally followed by trailing NaNs. Checked for all columns at once:
+    # the number of values must equal the position of the last value + 1.
+    mask = protocol_df.notna().to_numpy()
+    n_rows = mask.shape[0]
+    if n_rows == 0:
+        return
+    has_data = mask.any(axis=0)
+    last_valid = n_rows - 1 - mask[::-1].argmax(axis=0)
+    gaps = has_data & (mask.sum(axis=0) != last_valid + 1)
+    columns_with_empty_in_middle = list(protocol_df.columns[gaps])
     
     if columns_with_empty_in_middle:
         raise ValueError(f'The following columns contain empty data in the middle: {columns_with_empty_in_middle}')
@@ -603,15 +825,15 @@ def GetChannelInfo(protocol_df):
         ch_num += 1
     
     # get valid length of each channel
+    # (non-null counts of all columns in one pass)
+    counts = df_normalized.notna().sum().to_numpy()
     ch_valid_length = dict()
     valid_channels = []
     for i in range(ch_num):
         ch_name = 'CH' + str(i+1)
-        ch_status = df_normalized.iloc[:, i*expected_cols_per_channel+1]
-        ch_time = df_normalized.iloc[:, i*expected_cols_per_channel+2]
         
-        ch_valid_length[ch_name] = ch_status.count()
-        if ch_valid_length[ch_name] != ch_time.count():
+        ch_valid_length[ch_name] = int(counts[i*expected_cols_per_channel+1])
+        if ch_valid_length[ch_name] != counts[i*expected_cols_per_channel+2]:
             raise ValueError(f'Channel "{ch_name}" has different length of status and time columns.')
         
         # Check period and pulse_width columns if present
@@ -642,7 +864,86 @@ def GetChannelInfo(protocol_df):
     
     return ch_units, valid_channels
 
-def NormalizeSynonyms(protocol_df):
+# Time unit suffixes accepted on pulse parameter columns -> multiplier to ms
+_UNIT_MULTIPLIERS = {
+    'ms': 1,
+    'msec': 1,
+    'millisecond': 1,
+    'milliseconds': 1,
+    's': 1000,
+    'sec': 1000,
+    'second': 1000,
+    'seconds': 1000,
+    'm': 60000,
+    'min': 60000,
+    'minute': 60000,
+    'minutes': 60000,
+    'h': 3600000,
+    'hr': 3600000,
+    'hour': 3600000,
+    'hours': 3600000,
+}
+
+# Pulse parameter column names: CH#_param or CH#_param_unit, split into
+# (channel prefix, parameter name, unit suffix or None) by one match
+_PULSE_COL_RE = re.compile(r'(CH[^_]*)_(.*?)(?:_(%s))?' % '|'.join(map(re.escape, _UNIT_MULTIPLIERS)),
+                           re.DOTALL)
+
+# Column names already in standard form, which NormalizeSynonyms leaves as is
+_STANDARD_COL_RE = re.compile(r'CH[^_]*_(?:status|time|period|pulse_width|frequency|duty_cycle)(?:_(?:%s))?'
+                              % '|'.join(map(re.escape, _UNIT_MULTIPLIERS)))
+
+# Parameters that support time units
+_TIME_UNIT_PARAMS = frozenset({'period', 'pulse_width'})
+
+# Define synonym mappings (case-insensitive except for 'T')
+# Format: {synonym: standard_name}
+_PULSE_SYNONYMS = {
+    # Period synonyms
+    'period': 'period',
+    'Period': 'period',
+    'PERIOD': 'period',
+    'T': 'period',  # Capital T only (case-sensitive)
+    'cycle_time': 'period',
+    'cycletime': 'period',
+    
+    # Pulse_width synonyms
+    'pulse_width': 'pulse_width',
+    'pulsewidth': 'pulse_width',
+    'pulsewdith': 'pulse_width',  # Common typo
+    'pulse_wdith': 'pulse_width',  # Common typo
+    'PulseWidth': 'pulse_width',
+    'Pulse_Width': 'pulse_width',
+    'PW': 'pulse_width',
+    'pw': 'pulse_width',
+    'on_time': 'pulse_width',
+    'ontime': 'pulse_width',
+    
+    # Duty_cycle synonyms
+    'duty_cycle': 'duty_cycle',
+    'dutycycle': 'duty_cycle',
+    'DutyCycle': 'duty_cycle',
+    'Duty_Cycle': 'duty_cycle',
+    'DC': 'duty_cycle',
+    'dc': 'duty_cycle',
+    'duty': 'duty_cycle',
+    
+    # Frequency synonyms
+    'frequency': 'frequency',
+    'Frequency': 'frequency',
+    'FREQUENCY': 'frequency',
+    'freq': 'frequency',
+    'frq': 'frequency',
+    'f': 'frequency',
+    'hz': 'frequency',
+    'Hz': 'frequency',
+}
+
+# lookup table used by NormalizeSynonyms: lowercase synonym -> standard name
+# ('T' is handled separately because it is case-sensitive)
+_SYNONYM_LOWER = {syn.lower(): std for syn, std in _PULSE_SYNONYMS.items() if syn != 'T'}
+
+def NormalizeSynonyms(protocol_df, inplace=False):
     """
     Normalize column name synonyms to standard format.
     
@@ -657,87 +958,33 @@ def NormalizeSynonyms(protocol_df):
     
     Args:
         protocol_df: DataFrame with potentially synonym column names
+        inplace: rename the columns of protocol_df itself (modifies the
+            caller's DataFrame) instead of a copy
     
     Returns:
-        DataFrame with normalized column names
+        DataFrame with normalized column names (always a new DataFrame unless
+        inplace=True)
     """
-    df = protocol_df.copy()
-    
-    # Define synonym mappings (case-insensitive except for 'T')
-    # Format: {synonym: standard_name}
-    synonym_map = {
-        # Period synonyms
-        'period': 'period',
-        'Period': 'period',
-        'PERIOD': 'period',
-        'T': 'period',  # Capital T only (case-sensitive)
-        'cycle_time': 'period',
-        'cycletime': 'period',
-        
-        # Pulse_width synonyms
-        'pulse_width': 'pulse_width',
-        'pulsewidth': 'pulse_width',
-        'pulsewdith': 'pulse_width',  # Common typo
-        'pulse_wdith': 'pulse_width',  # Common typo
-        'PulseWidth': 'pulse_width',
-        'Pulse_Width': 'pulse_width',
-        'PW': 'pulse_width',
-        'pw': 'pulse_width',
-        'on_time': 'pulse_width',
-        'ontime': 'pulse_width',
-        
-        # Duty_cycle synonyms
-        'duty_cycle': 'duty_cycle',
-        'dutycycle': 'duty_cycle',
-        'DutyCycle': 'duty_cycle',
-        'Duty_Cycle': 'duty_cycle',
-        'DC': 'duty_cycle',
-        'dc': 'duty_cycle',
-        'duty': 'duty_cycle',
-        
-        # Frequency synonyms
-        'frequency': 'frequency',
-        'Frequency': 'frequency',
-        'FREQUENCY': 'frequency',
-        'freq': 'frequency',
-        'frq': 'frequency',
-        'f': 'frequency',
-        'hz': 'frequency',
-        'Hz': 'frequency',
-    }
+    # Most protocol files already use the standard names: nothing to rename
+    if all(col == 'Sections' or _STANDARD_COL_RE.fullmatch(col) for col in protocol_df.columns):
+        return protocol_df if inplace else protocol_df.copy()
     
     # Process each column
     new_columns = []
-    for col in df.columns:
+    for col in protocol_df.columns:
         if col == 'Sections':
             new_columns.append(col)
             continue
         
         # Parse column name: CH#_synonym or CH#_synonym_unit
-        parts = col.split('_')
-        if len(parts) < 2 or not parts[0].startswith('CH'):
+        # (the parameter name could be multi-part like 'pulse_width')
+        match = _PULSE_COL_RE.fullmatch(col)
+        if match is None:
             new_columns.append(col)
             continue
         
-        ch_prefix = parts[0]  # CH1, CH2, etc.
-        
-        # Detect if last part is a time unit suffix
-        time_units = ['ms', 'msec', 'millisecond', 'milliseconds',
-                     's', 'sec', 'second', 'seconds',
-                     'm', 'min', 'minute', 'minutes',
-                     'h', 'hr', 'hour', 'hours']
-        
-        has_unit_suffix = False
-        unit_suffix = ''
-        param_parts = parts[1:]  # Everything after CH#
-        
-        if param_parts[-1] in time_units:
-            has_unit_suffix = True
-            unit_suffix = param_parts[-1]
-            param_parts = param_parts[:-1]  # Remove unit suffix
-        
-        # Reconstruct parameter name (could be multi-part like 'pulse_width')
-        param_name = '_'.join(param_parts)
+        ch_prefix, param_name, unit_suffix = match.groups()  # CH1, CH2, etc.
+        has_unit_suffix = unit_suffix is not None
         
         # Special case: 'T' must be exactly 'T' (case-sensitive)
         if param_name == 'T':
@@ -752,11 +999,7 @@ def NormalizeSynonyms(protocol_df):
             )
         else:
             # Check if it's a synonym (case-insensitive for most)
-            standard_name = None
-            for syn, std in synonym_map.items():
-                if param_name.lower() == syn.lower() and syn != 'T':  # Case-insensitive except T
-                    standard_name = std
-                    break
+            standard_name = _SYNONYM_LOWER.get(param_name.lower())
             
             if standard_name is None:
                 # Not a pulse parameter synonym, keep original
@@ -771,11 +1014,14 @@ def NormalizeSynonyms(protocol_df):
         
         new_columns.append(new_col)
     
-    df.columns = new_columns
+    df = protocol_df if inplace else protocol_df.copy()
+    # with inplace=True, only touch the columns when one is actually renamed
+    if new_columns != list(protocol_df.columns):
+        df.columns = new_columns
     return df
 
 
-def ConvertPulseTimeUnits(protocol_df):
+def ConvertPulseTimeUnits(protocol_df, inplace=False):
     """
     Convert time unit suffixes in pulse parameter columns to milliseconds.
     
@@ -789,77 +1035,118 @@ def ConvertPulseTimeUnits(protocol_df):
     
     Args:
         protocol_df: DataFrame with potentially time-unit-suffixed columns
+        inplace: convert and rename in protocol_df itself (modifies the
+            caller's DataFrame) instead of a copy
     
     Returns:
         DataFrame with time units converted to ms and suffixes removed from column names
+        (always a new DataFrame unless inplace=True)
     """
-    df = protocol_df.copy()
-    
-    # Define time unit multipliers
-    unit_multipliers = {
-        'ms': 1,
-        'msec': 1,
-        'millisecond': 1,
-        'milliseconds': 1,
-        's': 1000,
-        'sec': 1000,
-        'second': 1000,
-        'seconds': 1000,
-        'm': 60000,
-        'min': 60000,
-        'minute': 60000,
-        'minutes': 60000,
-        'h': 3600000,
-        'hr': 3600000,
-        'hour': 3600000,
-        'hours': 3600000,
-    }
-    
-    # Parameters that support time units
-    time_unit_params = ['period', 'pulse_width']
-    
-    # Process columns
+    # Process columns: find the unit-suffixed ones first, so nothing is
+    # touched when there is nothing to convert
     columns_to_rename = {}
-    for col in df.columns:
+    cols_by_multiplier = defaultdict(list)
+    for col in protocol_df.columns:
         if col == 'Sections':
             continue
         
         # Parse: CH#_param_unit
-        parts = col.split('_')
-        if len(parts) < 3 or not parts[0].startswith('CH'):
-            continue
-        
-        # Check if this is a time-unit parameter
         # Could be CH#_period_unit or CH#_pulse_width_unit (2 words)
-        unit_suffix = parts[-1]
-        if unit_suffix not in unit_multipliers:
+        match = _PULSE_COL_RE.fullmatch(col)
+        if match is None:
             continue
         
-        # Determine parameter name (everything between CH# and unit)
-        param_parts = parts[1:-1]
-        param_name = '_'.join(param_parts)
+        ch_prefix, param_name, unit_suffix = match.groups()
         
-        if param_name not in time_unit_params:
+        # Check if this is a time-unit parameter
+        if unit_suffix is None or param_name not in _TIME_UNIT_PARAMS:
             continue
         
-        # Convert values
-        multiplier = unit_multipliers[unit_suffix]
+        # Mark values for conversion
+        multiplier = _UNIT_MULTIPLIERS[unit_suffix]
         if multiplier != 1:  # Only convert if not already in ms
-            df[col] = df[col] * multiplier
+            cols_by_multiplier[multiplier].append(col)
         
         # Mark for renaming (remove unit suffix)
-        ch_prefix = parts[0]
         new_col = f"{ch_prefix}_{param_name}"
         columns_to_rename[col] = new_col
     
-    # Rename columns to remove unit suffixes
-    if columns_to_rename:
-        df = df.rename(columns=columns_to_rename)
+    if not columns_to_rename:
+        return protocol_df if inplace else protocol_df.copy()
+    
+    df = protocol_df if inplace else protocol_df.copy()
+    # one multiply per unit (s, min, h) over all its columns at once
+    for multiplier, cols in cols_by_multiplier.items():
+        df[cols] = df[cols] * multiplier
+    
+    # Rename columns to remove unit suffixes (on df itself: a copy unless inplace)
+    df.columns = [columns_to_rename.get(col, col) for col in df.columns]
     
     return df
 
 
-def NormalizePulseParameters(protocol_df):
+def _parse_duty_cycle(values):
+    '''duty cycle cells -> percent; accepts "10%", "10.5%", 10 or decimal 0.1'''
+    import numpy as np
+    import pandas as pd
+    
+    values = np.array(values, dtype=object)
+    # Handle duty cycle with % sign: "10%" or "10.5%" → 10.0 or 10.5
+    is_str = pd.Series(values).map(type).eq(str).to_numpy()
+    if is_str.any():
+        text = pd.Series(values[is_str]).str.strip()
+        # an empty cell counts as 0; float() semantics (and errors) otherwise
+        is_empty = (text == '').to_numpy()
+        parsed = text.str.rstrip('%').to_numpy(dtype=object)
+        parsed[~is_empty] = parsed[~is_empty].astype(float)
+        parsed[is_empty] = 0
+        values[is_str] = parsed
+    
+    # Normalize duty cycle: support both decimal (0.1) and percentage (10) formats
+    # If duty cycle is between 0 and 1 (exclusive), treat as decimal and convert to percentage
+    dc = values.astype(float)
+    is_decimal = (dc > 0) & (dc <= 1)
+    values[is_decimal] = values[is_decimal] * 100.0  # Convert 0.1 → 10%
+    return values
+
+def _raise_pulse_error(ch_num, idx, case, freq, period, pw, dc, period_calculated):
+    '''raise the ValueError describing why one row of pulse parameters is invalid'''
+    # Validate duty cycle range
+    if dc > 100:
+        raise ValueError(
+            f"Invalid duty_cycle in {ch_num} row {idx+2}: {dc}%\n"
+            f"Duty cycle must be between 0% and 100% (or 0.0-1.0 in decimal format).\n"
+            f"A duty cycle > 100% means pulse width exceeds the period, which is impossible."
+        )
+    # Case 1: frequency + pulse_width, pulse_width must be <= period
+    if case == 1:
+        raise ValueError(
+            f"Invalid pulse parameters in {ch_num} row {idx+2}:\n"
+            f"  frequency={freq} Hz → period={period_calculated} ms\n"
+            f"  pulse_width={pw} ms\n"
+            f"Pulse width ({pw} ms) cannot exceed period ({period_calculated} ms).\n"
+            f"Either reduce pulse_width or reduce frequency."
+        )
+    # Case 3: period + pulse_width, pulse_width must be <= period
+    if case == 3:
+        raise ValueError(
+            f"Invalid pulse parameters in {ch_num} row {idx+2}:\n"
+            f"  period={period} ms\n"
+            f"  pulse_width={pw} ms\n"
+            f"Pulse width ({pw} ms) cannot exceed period ({period} ms).\n"
+            f"Either reduce pulse_width or increase period."
+        )
+    # Case 5: Partial specification - only one determinant
+    raise ValueError(
+        f"Incomplete pulse parameters in {ch_num} row {idx+2}:\n"
+        f"  frequency={freq}, period={period}, pulse_width={pw}, duty_cycle={dc}\n"
+        f"You must specify BOTH determinants:\n"
+        f"  - frequency/period AND pulse_width, OR\n"
+        f"  - frequency/period AND duty_cycle\n"
+        f"To disable pulsing, set both to 0 or leave both empty."
+    )
+
+def NormalizePulseParameters(protocol_df, inplace=False):
     """
     Convert various pulse parameter combinations to standard Period + pulse_width format (both in ms).
     
@@ -879,12 +1166,30 @@ def NormalizePulseParameters(protocol_df):
     - pulse_width must be <= period
     - duty_cycle must be <= 100%
     - Both determinants must be present (or both absent)
+    
+    Args:
+        protocol_df: DataFrame with normalized pulse parameter columns
+        inplace: add and drop columns in protocol_df itself (modifies the
+            caller's DataFrame) instead of a copy
     """
-    df = protocol_df.copy()
+    import numpy as np
+    import pandas as pd
+    df = protocol_df if inplace else protocol_df.copy()
     
-    # Find all channels
+    # Find all channels; membership tests below use a set of the original
+    # columns instead of scanning df.columns each time
+    col_set = set(df.columns)
     channel_cols = [col for col in df.columns if col.startswith('CH') and col.endswith('_status')]
     
+    def column_values(col, present):
+        '''raw cell values of col with NaN -> 0 (zeros if the column is absent)'''
+        if not present:
+            return np.zeros(len(df), dtype=int).astype(object)
+        values = df[col].to_numpy(dtype=object, copy=True)
+        values[pd.isna(values)] = 0
+        return values
+    
+    has_pulse_cols = False
     for ch_col in channel_cols:
         ch_num = ch_col.split('_')[0]  # e.g., 'CH1'
         
@@ -894,182 +1199,146 @@ def NormalizePulseParameters(protocol_df):
         pw_col = f'{ch_num}_pulse_width'
         dc_col = f'{ch_num}_duty_cycle'
         
-        has_freq = freq_col in df.columns
-        has_period = period_col in df.columns
-        has_pw = pw_col in df.columns
-        has_dc = dc_col in df.columns
+        has_freq = freq_col in col_set
+        has_period = period_col in col_set
+        has_pw = pw_col in col_set
+        has_dc = dc_col in col_set
         
         # Skip if no pulse parameters
         if not (has_freq or has_period or has_pw or has_dc):
             continue
-        
-        # Create standard columns if they don't exist (period and pulse_width)
-        if not has_period:
-            df[period_col] = 0
-        if not has_pw:
-            df[pw_col] = 0
-        
-        # Convert based on what's provided
-        for idx in df.index:
-            freq = df.loc[idx, freq_col] if has_freq else 0
-            period = df.loc[idx, period_col] if has_period else 0
-            pw = df.loc[idx, pw_col] if has_pw else 0
-            dc = df.loc[idx, dc_col] if has_dc else 0
-            
-            # Handle NaN
-            freq = 0 if pd.isna(freq) else freq
-            period = 0 if pd.isna(period) else period
-            pw = 0 if pd.isna(pw) else pw
-            dc = 0 if pd.isna(dc) else dc
-            
-            # Handle duty cycle with % sign: "10%" or "10.5%" → 10.0 or 10.5
-            if isinstance(dc, str):
-                dc = dc.strip()
-                if dc.endswith('%'):
-                    dc = float(dc.rstrip('%'))
-                else:
-                    dc = float(dc) if dc else 0
-            
-            # Normalize duty cycle: support both decimal (0.1) and percentage (10) formats
-            # If duty cycle is between 0 and 1 (exclusive), treat as decimal and convert to percentage
-            if 0 < dc <= 1:
-                dc = dc * 100.0  # Convert 0.1 → 10%
-            
-            # Validate duty cycle range
-            if dc > 100:
-                raise ValueError(
-                    f"Invalid duty_cycle in {ch_num} row {idx+2}: {dc}%\n"
-                    f"Duty cycle must be between 0% and 100% (or 0.0-1.0 in decimal format).\n"
-                    f"A duty cycle > 100% means pulse width exceeds the period, which is impossible."
-                )
-            
-            # Case 1: frequency + pulse_width → convert frequency to period
-            if freq > 0 and pw > 0:
-                period_calculated = int(1000.0 / freq)  # Convert Hz to ms
-                # Validate pulse_width <= period
-                if pw > period_calculated:
-                    raise ValueError(
-                        f"Invalid pulse parameters in {ch_num} row {idx+2}:\n"
-                        f"  frequency={freq} Hz → period={period_calculated} ms\n"
-                        f"  pulse_width={pw} ms\n"
-                        f"Pulse width ({pw} ms) cannot exceed period ({period_calculated} ms).\n"
-                        f"Either reduce pulse_width or reduce frequency."
-                    )
-                df.loc[idx, period_col] = period_calculated
-                df.loc[idx, pw_col] = int(pw)
-            
-            # Case 2: frequency + duty_cycle → calculate both period and pulse_width
-            elif freq > 0 and dc > 0:
-                period_calculated = int(1000.0 / freq)  # Convert Hz to ms
-                pw_calculated = int(period_calculated * dc / 100.0)
-                df.loc[idx, period_col] = period_calculated
-                df.loc[idx, pw_col] = pw_calculated
-            
-            # Case 3: period + pulse_width → already in standard format
-            elif period > 0 and pw > 0:
-                # Validate pulse_width <= period
-                if pw > period:
-                    raise ValueError(
-                        f"Invalid pulse parameters in {ch_num} row {idx+2}:\n"
-                        f"  period={period} ms\n"
-                        f"  pulse_width={pw} ms\n"
-                        f"Pulse width ({pw} ms) cannot exceed period ({period} ms).\n"
-                        f"Either reduce pulse_width or increase period."
-                    )
-                df.loc[idx, period_col] = int(period)
-                df.loc[idx, pw_col] = int(pw)
-            
-            # Case 4: period + duty_cycle → calculate pulse_width
-            elif period > 0 and dc > 0:
-                pw_calculated = int(period * dc / 100.0)
-                df.loc[idx, period_col] = int(period)
-                df.loc[idx, pw_col] = pw_calculated
-            
-            # Case 5: Partial specification - only one determinant (ERROR)
-            elif (freq > 0 and dc == 0 and pw == 0) or (period > 0 and dc == 0 and pw == 0):
-                raise ValueError(
-                    f"Incomplete pulse parameters in {ch_num} row {idx+2}:\n"
-                    f"  frequency={freq}, period={period}, pulse_width={pw}, duty_cycle={dc}\n"
-                    f"You must specify BOTH determinants:\n"
-                    f"  - frequency/period AND pulse_width, OR\n"
-                    f"  - frequency/period AND duty_cycle\n"
-                    f"To disable pulsing, set both to 0 or leave both empty."
-                )
-            elif (pw > 0 and freq == 0 and period == 0) or (dc > 0 and freq == 0 and period == 0):
-                raise ValueError(
-                    f"Incomplete pulse parameters in {ch_num} row {idx+2}:\n"
-                    f"  frequency={freq}, period={period}, pulse_width={pw}, duty_cycle={dc}\n"
-                    f"You must specify BOTH determinants:\n"
-                    f"  - frequency/period AND pulse_width, OR\n"
-                    f"  - frequency/period AND duty_cycle\n"
-                    f"To disable pulsing, set both to 0 or leave both empty."
-                )
-            
-            # Case 6: No pulse (all zeros or missing) - valid
-            else:
-                df.loc[idx, period_col] = 0
-                df.loc[idx, pw_col] = 0
+        has_pulse_cols = True
+        
+        # Convert based on what's provided, for all rows at once
+        freq_raw = column_values(freq_col, has_freq)
+        period_raw = column_values(period_col, has_period)
+        pw_raw = column_values(pw_col, has_pw)
+        # Duty cycle may be given as "10%", 10 or 0.1; normalized to percent
+        dc_raw = _parse_duty_cycle(column_values(dc_col, has_dc))
+        
+        freq = freq_raw.astype(float)
+        period = period_raw.astype(float)
+        pw = pw_raw.astype(float)
+        dc = dc_raw.astype(float)
+        
+        # period from frequency (Hz -> ms); rows without a frequency are not used
+        period_from_freq = (1000.0 / np.where(freq > 0, freq, 1)).astype(int)
+        
+        # each comparison is made once and the masks below are combined from them
+        has_f, has_T, has_w, has_d = freq > 0, period > 0, pw > 0, dc > 0
+        case_freq_pw = has_f & has_w                          # Case 1
+        case_freq_dc = has_f & has_d                          # Case 2
+        case_period_pw = has_T & has_w                        # Case 3
+        case_period_dc = has_T & has_d                        # Case 4
+        # Case 5: Partial specification - only one determinant (ERROR)
+        no_width = (dc == 0) & (pw == 0)
+        no_rate = (freq == 0) & (period == 0)
+        incomplete = ((has_f | has_T) & no_width) | ((has_w | has_d) & no_rate)
+        conditions = [case_freq_pw, case_freq_dc, case_period_pw, case_period_dc]
+        
+        # Rows that break a rule; the first one is reported, as it was when
+        # rows were checked one by one
+        case = np.select(conditions, [1, 2, 3, 4], default=0)
+        invalid = ((dc > 100)
+                   | ((case == 1) & (pw > period_from_freq))
+                   | ((case == 3) & (pw > period))
+                   | ((case == 0) & incomplete))
+        if invalid.any():
+            i = int(np.argmax(invalid))
+            _raise_pulse_error(ch_num, df.index[i], case[i], freq_raw[i], period_raw[i],
+                               pw_raw[i], dc_raw[i], period_from_freq[i])
+        
+        period_out = np.select(conditions, [
+            period_from_freq,                           # Case 1: frequency + pulse_width
+            period_from_freq,                           # Case 2: frequency + duty_cycle
+            period.astype(int),                         # Case 3: period + pulse_width
+            period.astype(int),                         # Case 4: period + duty_cycle
+        ], default=0)                                   # Case 6: No pulse (all zeros or missing)
+        pw_out = np.select(conditions, [
+            pw.astype(int),
+            (period_from_freq * dc / 100.0).astype(int),
+            pw.astype(int),
+            (period * dc / 100.0).astype(int),
+        ], default=0)
+        
+        # keep each existing column's dtype, as cell-by-cell assignment did;
+        # missing standard columns (period and pulse_width) are created here
+        # directly from the results rather than zero-filled first
+        period_dtype = df[period_col].dtype if has_period else np.int64
+        pw_dtype = df[pw_col].dtype if has_pw else np.int64
+        df[period_col] = pd.Series(period_out, index=df.index).astype(period_dtype)
+        df[pw_col] = pd.Series(pw_out, index=df.index).astype(pw_dtype)
         
         # Remove auxiliary columns (frequency, duty_cycle) after conversion
-        if has_freq and freq_col in df.columns:
+        if has_freq:
             df = df.drop(columns=[freq_col])
-        if has_dc and dc_col in df.columns:
+        if has_dc:
             df = df.drop(columns=[dc_col])
     
+    # lets ConvertTimeToMillisecond know the column layout without scanning names
+    df.attrs['has_pulse_cols'] = has_pulse_cols
     return df
 
-def ConvertTimeToMillisecond(protocol_df, ch_units):
-    df_ms = protocol_df.copy()
+# channel time units (as returned by GetChannelInfo) -> multiplier to ms
+_CHANNEL_UNIT_MS = {'ms': 1, 'sec': 1000, 'min': 60 * 1000, 'hr': 60 * 60 * 1000}
+
+def ConvertTimeToMillisecond(protocol_df, ch_units, inplace=False):
+    '''convert the protocol to integer milliseconds; with inplace=True the
+    caller's DataFrame is worked on directly (and left modified) instead of
+    being copied first'''
+    import numpy as np
+    df_ms = protocol_df if inplace else protocol_df.copy()
     
+    # df_ms is ours to modify from here on, so the steps below skip their own copies
     # Step 1: Normalize column name synonyms (T→period, PW→pulse_width, etc.)
-    df_ms = NormalizeSynonyms(df_ms)
+    df_ms = NormalizeSynonyms(df_ms, inplace=True)
     
     # Step 2: Convert pulse parameter time units to milliseconds
-    df_ms = ConvertPulseTimeUnits(df_ms)
+    df_ms = ConvertPulseTimeUnits(df_ms, inplace=True)
     
     # Step 3: Normalize pulse parameters (convert all formats to period + pulse_width in ms)
-    df_ms = NormalizePulseParameters(df_ms)
+    df_ms = NormalizePulseParameters(df_ms, inplace=True)
     
-    # Detect if we have pulse columns
-    has_pulse_cols = any('_period' in col for col in df_ms.columns)
+    # Detect if we have pulse columns (NormalizePulseParameters records it)
+    has_pulse_cols = df_ms.attrs['has_pulse_cols']
     expected_cols_per_channel = 4 if has_pulse_cols else 2
     
-    col_names = df_ms.columns.tolist()
-    for i in range(len(ch_units)):
-        col_names[i*expected_cols_per_channel+2] = col_names[i*expected_cols_per_channel+2].split('_')[0] + '_time_ms'
-    df_ms.columns = col_names
-    
-    for i in range(len(ch_units)):
-        time_col_idx = i*expected_cols_per_channel+2
-        if ch_units[i] == 'sec':
-            df_ms.iloc[:, time_col_idx] = df_ms.iloc[:, time_col_idx] * 1000
-        elif ch_units[i] == 'min':
-            df_ms.iloc[:, time_col_idx] = df_ms.iloc[:, time_col_idx] * 60 * 1000
-        elif ch_units[i] == 'hr':
-            df_ms.iloc[:, time_col_idx] = df_ms.iloc[:, time_col_idx] * 60 * 60 * 1000
-        elif ch_units[i] == 'ms':
-            pass
-        else:
-            raise ValueError(f'Channel time unit {ch_units[i]} is not recognized. Please use millisecond(msec, ms), second(sec, s), minute(min, m), or hour(hr, h).')
+    # Each channel's time column (third of its group) becomes CH#_time_ms
+    unit_cols = [df_ms.columns[i*expected_cols_per_channel+2] for i in range(len(ch_units))]
+    time_cols = [col.split('_')[0] + '_time_ms' for col in unit_cols]
+    df_ms.rename(columns=dict(zip(unit_cols, time_cols)), inplace=True)
+    
+    # Scale every time column by its channel's unit, one multiply per unit
+    unknown_units = [unit for unit in ch_units if unit not in _CHANNEL_UNIT_MS]
+    if unknown_units:
+        raise ValueError(f'Channel time unit {unknown_units[0]} is not recognized. Please use millisecond(msec, ms), second(sec, s), minute(min, m), or hour(hr, h).')
+    time_cols_by_scale = defaultdict(list)
+    for i, unit in enumerate(ch_units):
+        if _CHANNEL_UNIT_MS[unit] != 1:
+            time_cols_by_scale[_CHANNEL_UNIT_MS[unit]].append(time_cols[i])
+    for scale, cols in time_cols_by_scale.items():
+        df_ms[cols] = df_ms[cols] * scale
     
     # Fill NaN values with 0 for status and time columns
     # For period and pulse_width, fill NaN with 0 (means no pulsing)
-    for col in df_ms.columns:
-        if col.endswith('_status') or col.endswith('_time_ms'):
-            df_ms[col] = df_ms[col].fillna(0)
-    
-    # convert columns to appropriate types
-    for col in df_ms.columns[1:]:
-        if col.endswith('_status') or col.endswith('_time_ms') or col.endswith('_pulse_width') or col.endswith('_period'):
-            # These should be integers (period is now in ms, no more float needed)
-            df_ms[col] = df_ms[col].fillna(0).astype(int)
-    
-    # Check for values greater than 2^32 - 1, excluding strings and floats
-    for col in df_ms.columns:
-        if df_ms[col].dtype in [int, 'int64', 'int32'] and df_ms[col].max() > 2**32 - 1:
-            max_val = df_ms[col].max()
-            max_val_loc = df_ms[df_ms[col] == max_val].index.tolist()
-            raise ValueError(f'The value {max_val} in column "{col}" is larger than the maximum value of 2^32 - 1. Please check the following rows: {max_val_loc}')
+    # and convert them to integers (period is now in ms, no more float needed)
+    int_cols = [col for col in df_ms.columns[1:] if col.endswith(('_status', '_time_ms', '_pulse_width', '_period'))]
+    df_ms[int_cols] = df_ms[int_cols].fillna(0).astype(int)
+    
+    # Check for values greater than 2^32 - 1, excluding strings and floats.
+    # The columns stay signed 64-bit: CorrectTime_df re-casts them to int
+    # anyway, and an unsigned/32-bit cast here would silently wrap bad input
+    # (negative or oversized times) instead of reporting it below.
+    df_int = df_ms.select_dtypes('integer')
+    int_values = df_int.to_numpy()
+    col_max = int_values.max(axis=0, initial=0)
+    too_large = np.flatnonzero(col_max > 2**32 - 1)
+    if too_large.size:
+        j = too_large[0]
+        col, max_val = df_int.columns[j], col_max[j]
+        # rows are located on the array already in hand, not a boolean-indexed frame
+        max_val_loc = df_ms.index[int_values[:, j] == max_val].tolist()
+        raise ValueError(f'The value {max_val} in column "{col}" is larger than the maximum value of 2^32 - 1. Please check the following rows: {max_val_loc}')
     return df_ms
 
 def str2datetime(time_str):
@@ -1095,6 +1364,60 @@ def str2datetime(time_str):
     
     raise ValueError(f"Time data '{time_str}' does not match any of the formats: {time_only_formats + datetime_formats}")
 
+def _str2datetime_many(values):
+    '''str2datetime over many cells at once; None where a cell does not parse
+
+    Each format is tried with one pd.to_datetime call over the cells still
+    unparsed, instead of a raised-and-caught strptime error per cell and
+    format. Callers fall back to str2datetime for the None entries, which
+    keeps its error message for bad input.
+    '''
+    import pandas as pd
+    text = pd.Series([str(v) for v in values], dtype=object)
+    parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[us]')
+    # pandas rolls second 60/61 over into the next minute where strptime
+    # fails, so leave those to str2datetime
+    leap_second = text.str.contains(r':6[01]$')
+    today = pd.Timestamp(datetime.datetime.now().date())
+    for fmt in ['%H:%M', '%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S']:
+        todo = parsed.isna() & ~(leap_second & fmt.endswith('%S'))
+        if not todo.any():
+            continue
+        hit = pd.to_datetime(text[todo], format=fmt, errors='coerce')
+        if not fmt.startswith('%Y'):
+            # Time-only formats return 1900-01-01, replace with today
+            hit = today + (hit - hit.dt.normalize())
+        parsed[todo] = hit
+    return [None if pd.isna(t) else t.to_pydatetime() for t in parsed]
+
+# Start times given as plain numbers are countdowns in seconds. Python int and
+# float are by far the common case and are checked by exact type first; the
+# NumPy scalar types need numpy, which is only imported when it is needed.
+_FAST_NUM = frozenset({int, float})
+
+@lru_cache(maxsize=None)
+def _numeric_types():
+    import numpy as np
+    return (int, float, np.integer, np.floating)
+
+def _is_number(value):
+    return type(value) in _FAST_NUM or isinstance(value, _numeric_types())
+
+# Channel-name pattern and the header spellings accepted by the column-based
+# start time format (compared after lower-casing and dropping spaces/underscores)
+_CH_RE = re.compile(r'CH\d+')
+_NORM = str.maketrans('', '', ' _')
+_START_TIME_HEADERS = {
+    'channels': 'channels',
+    'starttime': 'start_time', 'start': 'start_time',
+    'waitstatus': 'wait_status', 'wait': 'wait_status',
+}
+
+def _start_time_columns_map(columns):
+    """Map 'channels'/'start_time'/'wait_status' to the matching column names (last match wins)"""
+    normalized = (str(col).lower().translate(_NORM) for col in columns)
+    return {_START_TIME_HEADERS[norm]: col for col, norm in zip(columns, normalized) if norm in _START_TIME_HEADERS}
+
 def ReadStartTime(df_startTime):
     """
     Read start time and wait status from DataFrame.
@@ -1112,12 +1435,7 @@ def ReadStartTime(df_startTime):
     """
     
     # Detect format by checking if 'Channels', 'Start_time', and 'Wait_status' columns exist
-    columns_lower = [col.lower().replace('_', '').replace(' ', '') for col in df_startTime.columns]
-    has_channels_col = any(col == 'channels' for col in columns_lower)
-    has_starttime_col = any(col in ['starttime', 'start'] for col in columns_lower)
-    has_waitstatus_col = any(col in ['waitstatus', 'wait'] for col in columns_lower)
-    
-    if has_channels_col and has_starttime_col and has_waitstatus_col:
+    if len(_start_time_columns_map(df_startTime.columns)) == 3:
         # Format 2: Column-based format (NEW)
         return _ReadStartTimeColumnFormat(df_startTime)
     else:
@@ -1126,17 +1444,10 @@ def ReadStartTime(df_startTime):
 
 def _ReadStartTimeColumnFormat(df_startTime):
     """Read start time from column-based format (Channels | Start_time | Wait_status)"""
+    import pandas as pd
     
     # Find the correct column names (case-insensitive)
-    columns_map = {}
-    for col in df_startTime.columns:
-        col_normalized = col.lower().replace('_', '').replace(' ', '')
-        if col_normalized == 'channels':
-            columns_map['channels'] = col
-        elif col_normalized in ['starttime', 'start']:
-            columns_map['start_time'] = col
-        elif col_normalized in ['waitstatus', 'wait']:
-            columns_map['wait_status'] = col
+    columns_map = _start_time_columns_map(df_startTime.columns)
     
     if len(columns_map) != 3:
         raise ValueError(f'Column-based format requires "Channels", "Start_time", and "Wait_status" columns. Found: {df_startTime.columns.tolist()}')
@@ -1147,31 +1458,30 @@ def _ReadStartTimeColumnFormat(df_startTime):
     wait_status_nans = []
     
     # Validate channel names
-    pattern = re.compile(r'CH\d+')
-    for idx, row in df_startTime.iterrows():
-        ch_name = row[columns_map['channels']]
-        
+    channel_cols = [columns_map['channels'], columns_map['start_time'], columns_map['wait_status']]
+    parsed_times = _str2datetime_many(df_startTime[columns_map['start_time']])
+    # if the start time does not have date, add the date of today
+    today = datetime.datetime.now().date()
+    rows = df_startTime[channel_cols].itertuples(index=False, name=None)
+    for (ch_name, ch_time, ch_status), parsed_time in zip(rows, parsed_times):
         # Handle NaN channel names
         if pd.isna(ch_name):
             continue
             
         ch_name = str(ch_name).strip()
-        if not pattern.match(ch_name):
+        if not _CH_RE.match(ch_name):
             raise ValueError(f'Channel name "{ch_name}" does not match the format CH + number (CH1, CH2, ..., starts from CH1).')
         
-        ch_time = row[columns_map['start_time']]
-        ch_status = row[columns_map['wait_status']]
-        
         # Process start time
         if pd.isna(ch_time):
             start_time[ch_name] = None
             start_time_nans.append(ch_name)
         elif type(ch_time) is datetime.time:
-            start_time[ch_name] = ch_time
-        elif isinstance(ch_time, (int, float, np.integer, np.floating)): # in seconds
+            start_time[ch_name] = datetime.datetime.combine(today, ch_time)
+        elif _is_number(ch_time): # in seconds
             start_time[ch_name] = ch_time
         else:
-            start_time[ch_name] = str2datetime(str(ch_time))
+            start_time[ch_name] = parsed_time if parsed_time is not None else str2datetime(str(ch_time))
             Warning(f'Channel "{ch_name}" start time is not in datetime format or countdown in seconds. Auto conversion may cause errors.')
         
         # Process wait status
@@ -1184,27 +1494,18 @@ def _ReadStartTimeColumnFormat(df_startTime):
     if start_time_nans != wait_status_nans:
         raise ValueError(f'Incomplete start time file. A channel should have both or neither start time and wait status')
     
-    # if the start time does not have date, add the date of today
-    today = datetime.datetime.now().date()
-    for key in start_time.keys():
-        if type(start_time[key]) is datetime.time:
-            start_time[key] = datetime.datetime.combine(today, start_time[key])
-    
     return start_time, wait_status
 
 def _ReadStartTimeRowFormat(df_startTime):
     """Read start time from row-based format (Original: CH1, CH2, CH3 as columns)"""
+    import pandas as pd
     
     # check if the start time file has only two rows
     if df_startTime.shape[0] != 2:
         raise ValueError('The start time file (row-based format) should have two rows: one for start_time and one for the wait_status.')
     
     # check if column names match 'CH' + number (ignore non-CH columns)
-    pattern = re.compile(r'CH\d+')
-    valid_columns = []
-    for col in df_startTime.columns:
-        if pattern.match(col):
-            valid_columns.append(col)
+    valid_columns = [col for col in df_startTime.columns if _CH_RE.match(col)]
     
     if not valid_columns:
         raise ValueError(f'No valid channel columns (CH1, CH2, ...) found. Columns: {df_startTime.columns.tolist()}')
@@ -1214,20 +1515,24 @@ def _ReadStartTimeRowFormat(df_startTime):
     wait_status = dict()
     start_time_nans = []
     wait_status_nans = []
+    # pull both rows out in one go instead of two .iloc lookups per column
+    time_row, status_row = df_startTime[valid_columns].to_dict(orient='records')
+    parsed_times = dict(zip(valid_columns, _str2datetime_many(time_row.values())))
+    # if the start time does not have date, add the date of today
+    today = datetime.datetime.now().date()
     for col in valid_columns:
-        # read as string using .iloc for position-based indexing
-        ch_time = df_startTime[col].iloc[0]
-        ch_status = df_startTime[col].iloc[1]
+        ch_time = time_row[col]
+        ch_status = status_row[col]
         
         if pd.isna(ch_time):
             start_time[col] = None
             start_time_nans.append(col)
         elif type(ch_time) is datetime.time:
-            start_time[col] = ch_time
-        elif isinstance(ch_time, (int, float, np.integer, np.floating)): # in seconds
+            start_time[col] = datetime.datetime.combine(today, ch_time)
+        elif _is_number(ch_time): # in seconds
             start_time[col] = ch_time
         else:
-            start_time[col] = str2datetime(str(ch_time))
+            start_time[col] = parsed_times[col] if parsed_times[col] is not None else str2datetime(str(ch_time))
             Warning(f'Channel "{col}" start time is not in datetime format or countdown in seconds. Auto conversion may cause errors.')
         if pd.isna(ch_status):
             wait_status[col] = None
@@ -1238,12 +1543,6 @@ def _ReadStartTimeRowFormat(df_startTime):
     if start_time_nans != wait_status_nans:
         raise ValueError(f'Incomplete start time file. A channel should have both or neither start time and wait status')
     
-    # if the start time does not have date, add the date of today
-    today = datetime.datetime.now().date()
-    for key in start_time.keys():
-        if type(start_time[key]) is datetime.time:
-            start_time[key] = datetime.datetime.combine(today, start_time[key])
-    
     return start_time, wait_status
 
 def CheckStartTimeForChannels(start_time, valid_channels):
@@ -1258,17 +1557,18 @@ def CheckStartTimeForChannels(start_time, valid_channels):
     # check if start time is earlier than current time
     earlier_start_time = []
     countdown_channels = []
+    now = datetime.datetime.now()
     for ch in valid_channels:
-        if isinstance(start_time[ch], (int, float, np.integer, np.floating)):
+        if _is_number(start_time[ch]):
             Warning(f'Channel "{ch}" start time is in seconds. It will be treated as countdown.')
             countdown_channels.append(ch)
-        elif type(start_time[ch]) is datetime.datetime and start_time[ch] < datetime.datetime.now():
+        elif type(start_time[ch]) is datetime.datetime and start_time[ch] < now:
             earlier_start_time.append(ch)
         else:
             # convert to string and then to datetime
             try:
                 start_time[ch] = str2datetime(str(start_time[ch]))
-                if start_time[ch] < datetime.datetime.now():
+                if start_time[ch] < now:
                     earlier_start_time.append(ch)
             except ValueError:
                 raise ValueError(f'Start time for channel {ch} is not recognized. Please use datetime format or countdown number in seconds.')
@@ -1277,41 +1577,40 @@ def CheckStartTimeForChannels(start_time, valid_channels):
 
 def CountDown(start_time):
     '''return the remaining time for each channel to start in milliseconds'''
-    # get remaining time for each channel to start, convert to milliseconds
+    # get remaining time for each channel to start, convert to milliseconds;
+    # every channel is measured from the same instant
     remaining_time = dict()
-    for ch in start_time.keys():
-        if isinstance(start_time[ch], (int, float, np.integer, np.floating)):
-            remaining_time[ch] = int(start_time[ch] * 1000)
-        elif type(start_time[ch]) is datetime.datetime:
-            remaining_time[ch] = int((start_time[ch] - datetime.datetime.now()).total_seconds() * 1000) 
+    now = datetime.datetime.now()
+    for ch, ch_start in start_time.items():
+        if _is_number(ch_start):
+            remaining_time[ch] = int(ch_start * 1000)
+        elif type(ch_start) is datetime.datetime:
+            remaining_time[ch] = int((ch_start - now).total_seconds() * 1000)
     return remaining_time
 
 def SendCommand(ser, command, time_out=5):
     command = str(command).strip()
-    cmd_t = command + '\n'
-    ser.write(cmd_t.encode('utf-8'))
-    t_cmd = time.time()
-    while True:
-        if ser.inWaiting() > 0:
-            fb = ser.readline().decode('utf-8').strip()
-            if fb == command.strip():
-                print(f'Python: Command "{cmd_t.strip()}" is sent successfully.')
-                break
-            else:
-                print(f'\033[31mCommand "{cmd_t.strip()}" is not received correctly. Received "{fb}".\033[0m')
-                break
-        if time.time() - t_cmd > time_out:
-            print(f'\033[31mCommand "{cmd_t.strip()}" is not received correctly. Timeout. Please check the connection.\033[0m')
-            break
+    ser.write((command + '\n').encode('utf-8'))
+    ser.flush()
+    t_fb, line = _read_line_timed(ser, time_out)
+    if t_fb is None:
+        print(f'\033[31mCommand "{command}" is not received correctly. Timeout. Please check the connection.\033[0m')
+        return
+    fb = line.decode('utf-8').strip()
+    if fb == command:
+        print(f'Python: Command "{command}" is sent successfully.')
+    else:
+        print(f'\033[31mCommand "{command}" is not received correctly. Received "{fb}".\033[0m')
 
-def SendGreeting(ser, time_out=10, expected_pattern_length=None):
+def SendGreeting(ser, time_out=10, expected_pattern_length=None, max_retries=3):
     """
     Send greeting to Arduino and parse configuration response.
     
     Args:
         ser: Serial connection object
-        time_out: Timeout in seconds
+        time_out: Timeout in seconds (for the whole exchange, retries included)
         expected_pattern_length: Expected PATTERN_LENGTH value (for verification)
+        max_retries: How many times the greeting is re-sent after an unexpected reply
         
     Returns:
         dict: Arduino configuration {'pattern_length': int, 'max_pattern_num': int, 'max_channel_num': int}
@@ -1320,81 +1619,80 @@ def SendGreeting(ser, time_out=10, expected_pattern_length=None):
     ser.reset_input_buffer()
     time.sleep(0.5)
     
-    greeting = 'Hello\n'
-    ser.write(greeting.encode('utf-8'))
+    ser.write(_GREETING)
     ser.flush()  # Ensure data is sent
-    t_greet = time.time()
+    deadline = time.time() + time_out
     
     arduino_config = {}
+    retries = 0
     
     while True:
-        if ser.inWaiting() > 0:
-            fb = ser.readline().decode('utf-8').strip()
+        t_fb, line = _read_line_timed(ser, deadline - time.time())
+        if t_fb is None:
+            raise TimeoutError(f'Greeting "Hello" is not received correctly. Timeout. Please check the connection.')
+        fb = line.decode('utf-8').strip()
+        
+        # Parse new format: "Salve;PATTERN_LENGTH:4;MAX_PATTERN_NUM:10;MAX_CHANNEL_NUM:8"
+        if fb.startswith('Salve'):
+            print('Arduino: Salve!')
             
-            # Parse new format: "Salve;PATTERN_LENGTH:4;MAX_PATTERN_NUM:10;MAX_CHANNEL_NUM:8"
-            if fb.startswith('Salve'):
-                print('Arduino: Salve!')
-                
-                # Parse configuration parameters
-                parts = fb.split(';')
-                for part in parts[1:]:  # Skip "Salve"
-                    if ':' in part:
-                        key, value = part.split(':', 1)
-                        key = key.strip().lower()
-                        try:
-                            arduino_config[key] = int(value.strip())
-                        except ValueError:
-                            print(f'\033[33mWarning: Could not parse {key}={value}\033[0m')
+            # Parse configuration parameters
+            for key, value in _KV_RE.findall(fb):
+                key = key.strip().lower()
+                try:
+                    arduino_config[key] = int(value.strip())
+                except ValueError:
+                    print(f'\033[33mWarning: Could not parse {key}={value}\033[0m')
+            
+            # Display configuration
+            if arduino_config:
+                print(f'Arduino Configuration:')
+                for key, val in arduino_config.items():
+                    print(f'  {key.upper()}: {val}')
                 
-                # Display configuration
-                if arduino_config:
-                    print(f'Arduino Configuration:')
-                    for key, val in arduino_config.items():
-                        print(f'  {key.upper()}: {val}')
+                # Verify PATTERN_LENGTH if specified
+                if expected_pattern_length is not None and 'pattern_length' in arduino_config:
+                    arduino_pl = arduino_config['pattern_length']
+                    python_pl = expected_pattern_length
                     
-                    # Verify PATTERN_LENGTH if specified
-                    if expected_pattern_length is not None and 'pattern_length' in arduino_config:
-                        arduino_pl = arduino_config['pattern_length']
-                        python_pl = expected_pattern_length
-                        
-                        if python_pl > arduino_pl:
-                            # Python needs more than Arduino can provide - this is an ERROR
-                            raise ValueError(
-                                f'\n\033[31mPATTERN_LENGTH MISMATCH!\033[0m\n'
-                                f'  Python requires: {python_pl}\n'
-                                f'  Arduino supports: {arduino_pl}\n'
-                                f'Protocol requires pattern length {python_pl} but Arduino only supports up to {arduino_pl}.\n'
-                                f'Please update Arduino sketch PATTERN_LENGTH to at least {python_pl}.'
-                            )
-                        elif python_pl < arduino_pl:
-                            # Python needs less than Arduino can provide - this is OK, just warn
-                            print(f'\033[33m⚠️  PATTERN_LENGTH mismatch (safe):\033[0m')
-                            print(f'\033[33m   Protocol uses: {python_pl}\033[0m')
-                            print(f'\033[33m   Arduino supports: {arduino_pl}\033[0m')
-                            print(f'   \033[32m✓ Compatible:\033[0m \033[33mArduino can handle smaller patterns.\033[0m')
-                        else:
-                            # Perfect match
-                            print(f'\033[32m✓ PATTERN_LENGTH verified: {expected_pattern_length}\033[0m')
-                
-                return arduino_config
-                
-            elif fb == 'Salve':
-                # Old format (backward compatible)
-                print('Arduino: Salve!')
-                print('\033[33mWarning: Arduino firmware does not report configuration. Consider updating firmware.\033[0m')
-                return {}
-                
-            elif fb:  # Got some response but not the expected one
-                print(f'Unexpected response: "{fb}". Retrying...')
-                # Try sending greeting again
-                ser.write(greeting.encode('utf-8'))
-                ser.flush()
-                t_greet = time.time()  # Reset timeout
-            else:
-                continue
-                
-        if time.time() - t_greet > time_out:
-            raise TimeoutError(f'Greeting "{greeting.strip()}" is not received correctly. Timeout. Please check the connection.')
+                    if python_pl > arduino_pl:
+                        # Python needs more than Arduino can provide - this is an ERROR
+                        raise ValueError(
+                            f'\n\033[31mPATTERN_LENGTH MISMATCH!\033[0m\n'
+                            f'  Python requires: {python_pl}\n'
+                            f'  Arduino supports: {arduino_pl}\n'
+                            f'Protocol requires pattern length {python_pl} but Arduino only supports up to {arduino_pl}.\n'
+                            f'Please update Arduino sketch PATTERN_LENGTH to at least {python_pl}.'
+                        )
+                    elif python_pl < arduino_pl:
+                        # Python needs less than Arduino can provide - this is OK, just warn
+                        print(f'\033[33m⚠️  PATTERN_LENGTH mismatch (safe):\033[0m')
+                        print(f'\033[33m   Protocol uses: {python_pl}\033[0m')
+                        print(f'\033[33m   Arduino supports: {arduino_pl}\033[0m')
+                        print(f'   \033[32m✓ Compatible:\033[0m \033[33mArduino can handle smaller patterns.\033[0m')
+                    else:
+                        # Perfect match
+                        print(f'\033[32m✓ PATTERN_LENGTH verified: {expected_pattern_length}\033[0m')
+            
+            return arduino_config
+            
+        elif fb == 'Salve':
+            # Old format (backward compatible)
+            print('Arduino: Salve!')
+            print('\033[33mWarning: Arduino firmware does not report configuration. Consider updating firmware.\033[0m')
+            return {}
+            
+        elif fb:  # Got some response but not the expected one
+            retries += 1
+            if retries > max_retries:
+                raise ConnectionError(f'Greeting "Hello" got no valid reply after {max_retries} retries. Last response: "{fb}".')
+            print(f'Unexpected response: "{fb}". Retrying...')
+            # Back off, drop whatever else is queued, then try sending greeting
+            # again; the deadline is not extended
+            time.sleep(0.1 * 2**retries)
+            ser.reset_input_buffer()
+            ser.write(_GREETING)
+            ser.flush()
     
     return arduino_config
 
@@ -1413,21 +1711,17 @@ def GetArduinoMemory(ser, time_out=5):
     """
     command = 'GET_MEMORY'
     ser.write((command + '\n').encode('utf-8'))
-    t_cmd = time.time()
+    # Block in the driver for each reply line instead of spinning on inWaiting()
+    deadline = time.perf_counter() + time_out
     
-    while True:
-        if ser.inWaiting() > 0:
-            response = ser.readline().decode('utf-8').strip()
+    while time.perf_counter() < deadline:
+        t_line, line = _read_line_timed(ser, deadline - time.perf_counter())
+        if t_line is not None:
+            response = line.decode('utf-8').strip()
             
             # Parse: MEMORY;FREE:12345;TOTAL:98304;PULSE_MODE:1;PULSE_COMPILE:dynamic
             if response.startswith('MEMORY;'):
-                parts = response.split(';')
-                memory_info = {}
-                
-                for part in parts[1:]:  # Skip "MEMORY"
-                    if ':' in part:
-                        key, value = part.split(':', 1)
-                        memory_info[key.lower()] = value
+                memory_info = {key.lower(): value for key, value in _KV_RE.findall(response)}
                 
                 # Convert numeric values
                 free_ram = int(memory_info.get('free', 0))
@@ -1445,10 +1739,9 @@ def GetArduinoMemory(ser, time_out=5):
                 return result
             elif response:
                 print(f'Unexpected response: "{response}"')
-                
-        if time.time() - t_cmd > time_out:
-            print(f'\033[31mGET_MEMORY timeout. Arduino may not support memory reporting.\033[0m')
-            return None
+    
+    print(f'\033[31mGET_MEMORY timeout. Arduino may not support memory reporting.\033[0m')
+    return None
 
 def CheckPulseModeCompatibility(ser, protocol_requires_pulse, time_out=5):
     """
@@ -1511,46 +1804,38 @@ def CheckPulseModeCompatibility(ser, protocol_requires_pulse, time_out=5):
         return True
 
 def SayBye(ser, time_out=5):
-    bye = 'Bye\n'
-    ser.write(bye.encode('utf-8'))
-    t_bye = time.time()
-    while True:
-        if ser.inWaiting() > 0:
-            fb = ser.readline().decode('utf-8').strip()
-            if fb == 'Arrivederci':
-                print('Arduino: Arrivederci!')
-                break
-            else:
-                print(f'\033[31mBye "{bye.strip()}" is not received correctly. Received "{fb}".\033[0m')
-                break
-        if time.time() - t_bye > time_out:
-            print(f'\033[31mBye "{bye.strip()}" is not received correctly. Timeout. Please check the connection.\033[0m')
-            break
+    ser.write(_BYE)
+    ser.flush()
+    t_fb, line = _read_line_timed(ser, time_out)
+    if t_fb is None:
+        print(f'\033[31mBye "Bye" is not received correctly. Timeout. Please check the connection.\033[0m')
+        return
+    fb = line.decode('utf-8').strip()
+    if fb == 'Arrivederci':
+        print('Arduino: Arrivederci!')
+    else:
+        print(f'\033[31mBye "Bye" is not received correctly. Received "{fb}".\033[0m')
 
 def MatchTime(ser, t_send=20, time_out=0):
-    t_timeout = time.time()
+    # deadline on the same clock as t1 and the arrival time t2
+    t_timeout = time.perf_counter()
     if time_out <= t_send:
         time_out = t_send + 5
     t_sent = int(t_send * 1e3) # convert to milliseconds
     calibrate = f'calibrate_{t_sent}\n'
     ser.write(calibrate.encode('utf-8'))
-    t1 = time.time()
+    t1 = time.perf_counter()
     time.sleep(t_send - 2)
-    while True:
-        if ser.inWaiting() > 0:
-            t2 = time.time()
-            fb = ser.readline().decode('utf-8').strip()
-            if fb.startswith('calibration'):
-                # print(fb)
-                t_feedback = t2 - t1
-                break
-            else:
-                print(f'\033[31mTime is not calibrated correctly. Received "{fb}".\033[0m')
-                break
-        if time.time() - t_timeout > time_out:
-            print(f'\033[31mTime is not calibrated correctly. Timeout. Please check the connection.\033[0m')
-            break
-    return t_feedback
+    # Block until the reply arrives; t2 is taken when its first byte comes in
+    t2, line = _read_line_timed(ser, t_timeout + time_out - time.perf_counter())
+    if t2 is None:
+        print(f'\033[31mTime is not calibrated correctly. Timeout. Please check the connection.\033[0m')
+        raise TimeoutError(f'No calibration reply within {time_out} s')
+    fb = line.decode('utf-8', 'replace').strip()
+    if not fb.startswith('calibration'):
+        print(f'\033[31mTime is not calibrated correctly. Received "{fb}".\033[0m')
+        raise ValueError(f'Unexpected calibration reply: "{fb}"')
+    return t2 - t1
 
 def countdown_timer(total_time, step=1):
     """
@@ -1561,6 +1846,54 @@ def countdown_timer(total_time, step=1):
         time.sleep(step)
     print("Time's up!                           ")
 
+def _linear_fit(x, y):
+    '''least-squares line y = slope * x + offset, solved in closed form
+
+    Returns (slope, offset, r_squared, rmse, max_error); the residual metrics
+    come from the same centered arrays as the fit.
+    '''
+    x_mean, y_mean = x.mean(), y.mean()
+    dx, dy = x - x_mean, y - y_mean
+    slope = (dx @ dy) / (dx @ dx)
+    offset = y_mean - slope * x_mean
+    residuals = dy - slope * dx
+    ss_res = residuals @ residuals
+    ss_tot = dy @ dy
+    r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 1.0
+    return slope, offset, r_squared, (ss_res / len(x)) ** 0.5, abs(residuals).max()
+
+def _start_timestamp_calibration(ser, duration, num_samples, use_countdown, countdown_interval):
+    '''start a V2 multi-timestamp run shared by the V2 calibrators
+
+    Sends the calibrate_timestamps command, starts the countdown thread if
+    requested and returns (timer thread or None, Python start time). The start
+    time uses the same clock as the arrival times from _read_line_timed.
+    '''
+    import threading
+    command = f'calibrate_timestamps_{duration}_{num_samples}\n'
+    ser.write(command.encode('utf-8'))
+    # Drain the transmit queue so the start time is taken right at the send.
+    # No separate acknowledgment is sent: the first (t=0) timestamp is it, and
+    # sleeping here would only let that reply sit unread in the buffer.
+    ser.flush()
+    
+    timer_thread = None
+    if use_countdown:
+        timer_thread = threading.Thread(target=countdown_timer, args=(duration, countdown_interval))
+        timer_thread.start()
+    
+    return timer_thread, time.perf_counter()
+
+def _parse_calib_timestamp(line):
+    '''Arduino milliseconds from a calib_timestamp_XXXXX line, None for other lines
+
+    Parsed as bytes; only the rare unexpected line gets decoded by the caller.
+    '''
+    response = line.strip()
+    if response.startswith(b'calib_timestamp_'):
+        return int(response.split(b'_')[2])
+    return None
+
 def CalibrateArduinoTime_v2(ser, duration=300, num_samples=30, use_countdown=True):
     '''
     Improved calibration using multi-timestamp method.
@@ -1588,23 +1921,14 @@ def CalibrateArduinoTime_v2(ser, duration=300, num_samples=30, use_countdown=Tru
             - timing_stable: Boolean indicating if timing is stable
             - arduino_times: Array of Arduino-reported times
             - python_times: Array of Python-measured times
+            - cost, t_send, t_feedback: aliases of offset, arduino_times and
+              python_times in the CalibrateArduinoTime() format
     '''
+    import numpy as np
     print(f'Calibrating Arduino time (v2 - multi-timestamp method)...')
     print(f'Duration: {duration}s with {num_samples} samples')
     
-    # Send calibration command
-    command = f'calibrate_timestamps_{duration}_{num_samples}\n'
-    ser.write(command.encode('utf-8'))
-    
-    # Wait for Arduino acknowledgment
-    time.sleep(0.1)
-    
-    # Start countdown timer in separate thread if requested
-    if use_countdown:
-        timer_thread = threading.Thread(target=countdown_timer, args=(duration, 5))
-        timer_thread.start()
-    
-    t_start_python = time.time()
+    timer_thread, t_start_python = _start_timestamp_calibration(ser, duration, num_samples, use_countdown, 5)
     
     # Collect timestamp reports
     timestamps_arduino = []
@@ -1616,30 +1940,23 @@ def CalibrateArduinoTime_v2(ser, duration=300, num_samples=30, use_countdown=Tru
     print(f'\nCollecting {expected_reports} timestamps...')
     
     for i in range(expected_reports):
-        # Wait for data with timeout
-        wait_start = time.time()
-        while ser.inWaiting() == 0:
-            if time.time() - wait_start > timeout:
-                raise TimeoutError(f'Calibration timeout waiting for timestamp {i+1}/{expected_reports}')
-            time.sleep(0.01)
-        
-        # Record Python time when data arrives
-        t_python = time.time()
-        response = ser.readline().decode('utf-8').strip()
-        
-        if response.startswith('calib_timestamp_'):
-            # Parse Arduino timestamp
-            arduino_ms = int(response.split('_')[2])
+        # Wait for data with timeout; Python time is recorded when data arrives
+        t_python, line = _read_line_timed(ser, timeout)
+        if t_python is None:
+            raise TimeoutError(f'Calibration timeout waiting for timestamp {i+1}/{expected_reports}')
+        arduino_ms = _parse_calib_timestamp(line)
+        
+        if arduino_ms is not None:
             timestamps_arduino.append(arduino_ms / 1000.0)  # Convert to seconds
             timestamps_python.append(t_python - t_start_python)
             
             if (i + 1) % 3 == 0 or i == 0:
                 print(f'  Sample {i+1}/{expected_reports}: Arduino={arduino_ms}ms, Python={timestamps_python[-1]:.3f}s')
         else:
-            print(f'\033[33mWarning: Unexpected response during calibration: "{response}"\033[0m')
+            print(f'\033[33mWarning: Unexpected response during calibration: "{line.strip().decode("utf-8", "replace")}"\033[0m')
     
     # Wait for countdown timer to finish
-    if use_countdown:
+    if timer_thread:
         timer_thread.join()
     
     # Convert to numpy arrays for analysis
@@ -1651,24 +1968,9 @@ def CalibrateArduinoTime_v2(ser, duration=300, num_samples=30, use_countdown=Tru
     # The factor accounts for BOTH clock speed difference AND system overhead
     # - calib_factor > 1: System (Python) measures MORE time than Arduino reports → Arduino slow
     # - calib_factor < 1: System (Python) measures LESS time than Arduino reports → Arduino fast
-    coefficients = np.polyfit(arduino_times, python_times, 1)
-    calib_factor = coefficients[0]
-    offset = coefficients[1]
-    
-    # Calculate quality metrics using the fitted relationship
-    y_pred = calib_factor * arduino_times + offset
-    residuals = python_times - y_pred
-    
-    # R-squared
-    ss_res = np.sum(residuals ** 2)
-    ss_tot = np.sum((python_times - np.mean(python_times)) ** 2)
-    r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 1.0
-    
-    # RMSE (Root Mean Square Error)
-    rmse = np.sqrt(np.mean(residuals ** 2))
-    
-    # Maximum absolute error
-    max_error = np.max(np.abs(residuals))
+    # Quality metrics: R-squared, RMSE (Root Mean Square Error) and the
+    # maximum absolute error of the fitted relationship
+    calib_factor, offset, r_squared, rmse, max_error = _linear_fit(arduino_times, python_times)
     
     # Timing stability check (max error should be < 500ms)
     timing_stable = max_error < 0.5
@@ -1721,7 +2023,10 @@ def CalibrateArduinoTime_v2(ser, duration=300, num_samples=30, use_countdown=Tru
         'timing_stable': timing_stable,
         'arduino_times': arduino_times,
         'python_times': python_times,
-        'cost': offset  # For backward compatibility with old code
+        # For backward compatibility with old code (CalibrateArduinoTime format)
+        'cost': offset,
+        't_send': arduino_times,
+        't_feedback': python_times
     }
 
 def CalibrateArduinoTime(ser, t_send=None, use_v2=False):
@@ -1738,23 +2043,21 @@ def CalibrateArduinoTime(ser, t_send=None, use_v2=False):
             - calib_factor: Calibration factor
             - cost: Time offset
             - r_squared: R-squared goodness of fit
-            - t_send: Array of sent times (v1 only)
-            - t_feedback: Array of feedback times (v1 only)
+            - t_send: Array of sent times (v2: Arduino-reported times)
+            - t_feedback: Array of feedback times (v2: Python-measured times)
+            With use_v2 the full CalibrateArduinoTime_v2() result is returned,
+            which has these keys as well.
     
     Note: Original implementation kept for backward compatibility.
           For new code, consider using CalibrateArduinoTime_v2() directly for better performance.
     '''
+    import threading
+    import numpy as np
     # Use improved method if requested
     if use_v2:
-        result = CalibrateArduinoTime_v2(ser, duration=300, num_samples=30)
-        # Return dict compatible with old format
-        return {
-            'calib_factor': result['calib_factor'],
-            'cost': result['offset'],
-            'r_squared': result['r_squared'],
-            't_send': result['arduino_times'],
-            't_feedback': result['python_times']
-        }
+        # The v2 result already carries the old key names (cost, t_send,
+        # t_feedback) alongside its own, so it is returned as is
+        return CalibrateArduinoTime_v2(ser, duration=300, num_samples=30)
     
     # Original implementation below
     if t_send is None:
@@ -1779,16 +2082,9 @@ def CalibrateArduinoTime(ser, t_send=None, use_v2=False):
     # linear regression
     t_sent = np.array(t_send)
     t_feed = np.array(t_feedback)
-    coefficients = np.polyfit(t_sent, t_feed, 1)
-    linear_fit = np.poly1d(coefficients)
+    calib_factor, cost, r_squared, _, _ = _linear_fit(t_sent, t_feed)
     
-    # Calculate R-squared
-    y_pred = linear_fit(t_send)
-    ss_res = np.sum((t_feedback - y_pred) ** 2)
-    ss_tot = np.sum((t_feedback - np.mean(t_feedback)) ** 2)
-    r_squared = 1 - (ss_res / ss_tot)
-    
-    kwargs_output = {'calib_factor': coefficients[0], 'cost': coefficients[1], 'r_squared': r_squared, 't_send': t_sent, 't_feedback': t_feed}
+    kwargs_output = {'calib_factor': calib_factor, 'cost': cost, 'r_squared': r_squared, 't_send': t_sent, 't_feedback': t_feed}
     
     return kwargs_output
 
@@ -1798,8 +2094,9 @@ def CalibrateArduinoTime_v11(ser, t_send=None, use_countdown=True):
     V1.1 calibration method: V1 logic with active wait instead of dead sleep
     
     This method uses the same Arduino-side logic as V1 (Arduino waits, Python measures),
-    but Python actively polls for the response instead of using dead sleep.
-    This provides better timing precision and more responsive response detection.
+    but Python blocks in the serial driver until the response arrives instead of
+    using dead sleep, timing it with time.perf_counter(). This provides better
+    timing precision and more responsive response detection.
     
     Args:
         ser: Serial port connection
@@ -1818,6 +2115,8 @@ def CalibrateArduinoTime_v11(ser, t_send=None, use_countdown=True):
         result = CalibrateArduinoTime_v11(ser, t_send=[60, 80, 80, 80])
         print(f"Calibration factor: {result['calib_factor']:.6f}")
     '''
+    import threading
+    import numpy as np
     if t_send is None:
         t_send = [60, 70, 80, 90]
     elif isinstance(t_send, (int, float)):
@@ -1846,37 +2145,34 @@ def CalibrateArduinoTime_v11(ser, t_send=None, use_countdown=True):
     requested_times = []
     python_times = []
     
-    import_time = time.time()
-    
     for t_requested in t_send:
         # Send V1.1 command: calibrate_v11_XXXXX (in milliseconds)
         command = f'calibrate_v11_{int(t_requested * 1000)}\n'
         ser.write(command.encode('utf-8'))
         ser.flush()
         
-        # Measure real elapsed time - active wait (no dead sleep)
-        t_start = time.time()
+        # Measure real elapsed time (no dead sleep); same clock as the
+        # arrival times from _read_line_timed
+        t_start = time.perf_counter()
+        deadline = t_start + t_requested + 5
         
-        # Actively wait for response
-        timeout_start = time.time()
+        # Wait for the response without polling
         arduino_elapsed = None
         
         while True:
-            if ser.inWaiting() > 0:
-                t_end = time.time()
-                response = ser.readline().decode('utf-8').strip()
-                # Response format: calibration_v11_XXXXX
-                if response.startswith('calibration_v11_'):
-                    arduino_ms = int(response.split('_')[2])
-                    arduino_elapsed = arduino_ms / 1000.0
-                    break
-            
-            if time.time() - timeout_start > t_requested + 5:
+            # Blocks in the driver until the response starts arriving
+            t_end, line = _read_line_timed(ser, deadline - time.perf_counter())
+            if t_end is None:
                 print(f"Timeout waiting for {t_requested}s response")
-                t_end = time.time()
+                t_end = time.perf_counter()
                 break
             
-            time.sleep(0.001)  # Minimal sleep to prevent CPU overload
+            response = line.strip()
+            # Response format: calibration_v11_XXXXX
+            if response.startswith(b'calibration_v11_'):
+                arduino_ms = int(response.split(b'_')[2])
+                arduino_elapsed = arduino_ms / 1000.0
+                break
         
         python_elapsed = t_end - t_start
         
@@ -1905,15 +2201,7 @@ def CalibrateArduinoTime_v11(ser, t_send=None, use_countdown=True):
         requested = np.array(requested_times)
         python = np.array(python_times)
         
-        coefficients = np.polyfit(requested, python, 1)
-        calib_factor = coefficients[0]
-        offset = coefficients[1]
-        
-        # Calculate R-squared
-        y_pred = calib_factor * requested + offset
-        ss_res = np.sum((python - y_pred) ** 2)
-        ss_tot = np.sum((python - np.mean(python)) ** 2)
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 1.0
+        calib_factor, offset, r_squared, _, _ = _linear_fit(requested, python)
         
         print(f'\n{"V1.1 Analysis:":<30}')
         print(f'  {"Calibration factor:":<30} {calib_factor:.6f}')
@@ -1963,6 +2251,7 @@ def CalibrateArduinoTime_v2_improved(ser, duration=180, num_samples=9, use_count
         result = CalibrateArduinoTime_v2_improved(ser, duration=300, num_samples=9)
         print(f"Calibration factor: {result['calib_factor']:.6f}")
     '''
+    import numpy as np
     print(f'\n{"="*70}')
     print(f'V2 CALIBRATION (Multi-Timestamp Method - Improved)')
     print(f'{"="*70}')
@@ -1970,49 +2259,34 @@ def CalibrateArduinoTime_v2_improved(ser, duration=180, num_samples=9, use_count
     print(f'V2: Arduino sends timestamps, Python records when they arrive')
     print(f'Fitting python vs arduino accounts for clock speed + communication')
     
-    # Send V2 command
-    command = f'calibrate_timestamps_{duration}_{num_samples}\n'
-    print(f'Sending: {command.strip()}')
-    
-    ser.write(command.encode('utf-8'))
-    time.sleep(0.1)
-    
-    # Start countdown timer if enabled
-    if use_countdown:
-        timer_thread = threading.Thread(target=countdown_timer, args=(duration, 10,))
-        timer_thread.start()
-    
-    t_start_python = time.time()
-    
-    print(f'\n{"#":<5} {"Arduino Time":<15} {"Python Time":<15} {"Difference":<12}')
-    print(f'{"":5} {"(seconds)":<15} {"(seconds)":<15} {"(Py - Ard)":<12}')
-    print(f'{"-"*52}')
+    print(f'Sending: calibrate_timestamps_{duration}_{num_samples}')
+    timer_thread, t_start_python = _start_timestamp_calibration(ser, duration, num_samples, use_countdown, 10)
     
     results = []
     expected_samples = num_samples + 1  # Including initial timestamp at 0
     
     print(f'Collecting {expected_samples} timestamps over {duration} seconds...')
     
+    # The sample table is written in one go after the run, so no console
+    # write sits between a reply arriving and the wait for the next one
+    log_lines = [
+        f'\n{"#":<5} {"Arduino Time":<15} {"Python Time":<15} {"Difference":<12}',
+        f'{"":5} {"(seconds)":<15} {"(seconds)":<15} {"(Py - Ard)":<12}',
+        f'{"-"*52}',
+    ]
+    
     for i in range(expected_samples):
-        timeout_start = time.time()
-        while ser.inWaiting() == 0:
-            if time.time() - timeout_start > duration + 5:
-                print(f"Timeout waiting for sample {i+1}/{expected_samples}")
-                break
-            time.sleep(0.01)
-        
-        if ser.inWaiting() > 0:
-            t_arrival = time.time()
-            response = ser.readline().decode('utf-8').strip()
-            
-            # Response format: calib_timestamp_XXXXX
-            if response.startswith('calib_timestamp_'):
-                arduino_ms = int(response.split('_')[2])
+        t_arrival, line = _read_line_timed(ser, duration + 5)
+        if t_arrival is None:
+            log_lines.append(f"Timeout waiting for sample {i+1}/{expected_samples}")
+        else:
+            arduino_ms = _parse_calib_timestamp(line)
+            if arduino_ms is not None:
                 arduino_s = arduino_ms / 1000.0
                 python_s = t_arrival - t_start_python
                 diff = python_s - arduino_s
                 
-                print(f'{i+1:<5} {arduino_s:<15.6f} {python_s:<15.6f} {diff:<12.6f}')
+                log_lines.append(f'{i+1:<5} {arduino_s:<15.6f} {python_s:<15.6f} {diff:<12.6f}')
                 
                 results.append({
                     'arduino': arduino_s,
@@ -2020,8 +2294,9 @@ def CalibrateArduinoTime_v2_improved(ser, duration=180, num_samples=9, use_count
                     'diff': diff
                 })
     
-    if use_countdown:
+    if timer_thread:
         timer_thread.join()
+    sys.stdout.write('\n'.join(log_lines) + '\n')
     
     # Calculate calibration factor (excluding t=0)
     if len(results) >= 2:
@@ -2033,15 +2308,7 @@ def CalibrateArduinoTime_v2_improved(ser, duration=180, num_samples=9, use_count
         diffs = np.array([r['diff'] for r in results_for_calib])
         
         # Fit python vs arduino: python_time = factor × arduino_time + offset
-        coefficients = np.polyfit(arduino, python, 1)
-        calib_factor = coefficients[0]
-        offset = coefficients[1]
-        
-        # Calculate R-squared
-        y_pred = calib_factor * arduino + offset
-        ss_res = np.sum((python - y_pred) ** 2)
-        ss_tot = np.sum((python - np.mean(python)) ** 2)
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 1.0
+        calib_factor, offset, r_squared, _, _ = _linear_fit(arduino, python)
         
         avg_diff = np.mean(diffs)
         std_diff = np.std(diffs)
@@ -2123,6 +2390,10 @@ def auto_calibrate_arduino(ser, method='v2', force_recalibrate=False, db_path='c
     print(f'Performing Calibration (Method: {method.upper()})')
     print(f'{"="*70}\n')
     
+    # Ports opened by SetUpSerialPort already have this; ports opened
+    # elsewhere would otherwise calibrate with up to 16 ms of USB read jitter
+    _set_low_latency(ser)
+    
     if method == 'v1':
         result = CalibrateArduinoTime(ser, use_v2=False)
     elif method == 'v1.1':
@@ -2141,30 +2412,42 @@ def auto_calibrate_arduino(ser, method='v2', force_recalibrate=False, db_path='c
 
 
 def CorrectTime_df(df_ms, calib_factor):
-    df_corrected = df_ms.copy()
-    for col in df_corrected.columns:
-        if col.endswith('_time_ms'):
-            df_corrected[col] = df_corrected[col] / calib_factor
-    df_corrected = df_corrected.fillna(0)
-    
-    # Convert columns to appropriate types (all integers now - no more floats)
-    for col in df_corrected.columns[1:]:
-        df_corrected[col] = df_corrected[col].astype(int)
+    import numpy as np
+    time_cols = [col for col in df_ms.columns if col.endswith('_time_ms')]
+    other_cols = [col for col in df_ms.columns[1:] if not col.endswith('_time_ms')]
+    
+    # One divide over all time columns at once
+    times = df_ms[time_cols].to_numpy(dtype=float) / calib_factor
+    times[np.isnan(times)] = 0
+    
+    # fillna returns a new frame, so no separate copy is needed; the other
+    # columns are cast by the same astype call instead of being reassigned
+    # (all integers now - no more floats)
+    df_corrected = df_ms.fillna(0).astype(dict.fromkeys(other_cols, int))
+    df_corrected[time_cols] = times.astype(int)
     return df_corrected
 
 def CorrectTime_dict(remaining_time, calib_factor):
+    if len(remaining_time) > 4:
+        import numpy as np
+        # One divide for all channels; astype truncates toward zero like int()
+        times = np.fromiter(remaining_time.values(), dtype=float, count=len(remaining_time)) / calib_factor
+        if np.isfinite(times).all():
+            return dict(zip(remaining_time, times.astype(np.int64).tolist()))
+        # NaN/inf: let int() below raise its usual error
     remaining_time_corrected = dict()
     for ch, t in remaining_time.items():
         remaining_time_corrected[ch] = int(t / calib_factor)
     return remaining_time_corrected
 
 def CorrectTime(dataIn, calib_factor=1):
-    if type(dataIn) is pd.DataFrame:
-        return CorrectTime_df(dataIn, calib_factor)
-    elif type(dataIn) is dict:
+    # dicts are checked first: they need no pandas import
+    if isinstance(dataIn, dict):
         return CorrectTime_dict(dataIn, calib_factor)
-    else:
-        raise ValueError('Input data type is not recognized. Please use pandas DataFrame or dictionary.')
+    import pandas as pd
+    if isinstance(dataIn, pd.DataFrame):
+        return CorrectTime_df(dataIn, calib_factor)
+    raise ValueError('Input data type is not recognized. Please use pandas DataFrame or dictionary.')
 
 def FindRepeatedPatterns(df_ms, pattern_length=2):
     """
@@ -2178,6 +2461,7 @@ def FindRepeatedPatterns(df_ms, pattern_length=2):
     :param pattern_length: the length of the pattern to search for
     :return: a dictionary with channel names as keys and their compressed patterns as values
     """
+    import numpy as np
     compressed_patterns = {}
     
     # Detect how many channels we have
@@ -2191,65 +2475,105 @@ def FindRepeatedPatterns(df_ms, pattern_length=2):
         period_col = f'CH{n}_period'
         pw_col = f'CH{n}_pulse_width'
         
-        status_data = df_ms[status_col].tolist()
-        time_data = df_ms[time_col].tolist()
-        
         # Check if period and pulse_width columns exist
         has_pulse_cols = period_col in df_ms.columns and pw_col in df_ms.columns
         
         if has_pulse_cols:
-            period_data = df_ms[period_col].tolist()
-            pw_data = df_ms[pw_col].tolist()
+            row_cols = [status_col, time_col, period_col, pw_col]
+        else:
+            # Old format: status and time only
+            row_cols = [status_col, time_col]
+        # Read each column once as an array; rows are only boxed into Python
+        # tuples for the patterns that end up in the output
+        arrays = [df_ms[col].to_numpy() for col in row_cols]
+        n_rows = len(df_ms)
+        
+        if has_pulse_cols:
+            period_data, pw_data = arrays[2], arrays[3]
             
-            # Validate pulse data consistency
-            for idx, (period, pw) in enumerate(zip(period_data, pw_data)):
-                # Convert NaN to 0 for easier checking
-                period_val = 0 if pd.isna(period) else period
-                pw_val = 0 if pd.isna(pw) else pw
-                
-                # Skip if both are 0 (valid: no pulsing)
-                if period_val == 0 and pw_val == 0:
-                    continue
-                    
-                # Check for inconsistent values (one specified, other not)
-                if period_val > 0 and pw_val == 0:
+            # Validate pulse data consistency for all rows at once
+            # (NaN counts as 0; both 0 is valid: no pulsing)
+            period_arr = df_ms[period_col].fillna(0).to_numpy()
+            pw_arr = df_ms[pw_col].fillna(0).to_numpy()
+            # Check for inconsistent values (one specified, other not)
+            period_only = (period_arr > 0) & (pw_arr == 0)
+            pw_only = (period_arr == 0) & (pw_arr > 0)
+            bad_rows = np.flatnonzero(period_only | pw_only)
+            if bad_rows.size:
+                idx = bad_rows[0]
+                period_val, pw_val = period_data[idx], pw_data[idx]
+                if period_only[idx]:
                     raise ValueError(
                         f"Invalid pulse data in {period_col} row {idx+2}: "
                         f"period={period_val} ms but pulse_width is 0 or empty. "
                         f"Both period and pulse_width must be specified for pulsing, "
                         f"or both should be 0 for no pulsing."
                     )
-                if period_val == 0 and pw_val > 0:
+                else:
                     raise ValueError(
                         f"Invalid pulse data in {period_col} row {idx+2}: "
                         f"pulse_width={pw_val} ms but period is 0 or empty. "
                         f"Both period and pulse_width must be specified for pulsing, "
                         f"or both should be 0 for no pulsing."
                     )
-            
-            # Combine status, time, period, and pulse_width into tuples
-            combined = list(zip(status_data, time_data, period_data, pw_data))
-        else:
-            # Combine status and time into tuples (old format)
-            combined = list(zip(status_data, time_data))
         
-        patterns = []
+        # same_lag[k]: row k equals row k + pattern_length in every column,
+        # computed for all rows at once instead of comparing tuple slices
+        same_lag = np.ones(max(n_rows - pattern_length, 0), dtype=bool)
+        for values in arrays:
+            same_lag &= values[pattern_length:] == values[:-pattern_length]
+        
+        if pattern_length == 1:
+            # Single-row patterns are runs of identical rows, and each run
+            # starts where any column changes value
+            starts = np.flatnonzero(~same_lag) + 1
+            bounds = [0, *starts.tolist(), n_rows] if n_rows else [0]
+            # Box only the first row of each run
+            first_rows = zip(*(values[bounds[:-1]].tolist() for values in arrays))
+            compressed_patterns[f'CH{n}'] = [{'pattern': (row,), 'repeats': end - start}
+                                             for row, start, end in zip(first_rows, bounds[:-1], bounds[1:])]
+            continue
+        
+        # The block at j repeats the one at j - pattern_length exactly when
+        # same_lag[j - pattern_length:j] is all true; prefix sums make that an
+        # O(1) check per block
+        lag_sum = np.concatenate(([0], np.cumsum(same_lag))).tolist()
+        runs = []
         i = 0
-        while i < len(combined):
-            # Extract the current pattern
-            current_pattern = tuple(combined[i:i + pattern_length])
+        while i < n_rows:
             count = 1
             j = i + pattern_length
             # Check for consecutive repeats of the current pattern
-            while j + pattern_length <= len(combined) and tuple(combined[j:j + pattern_length]) == current_pattern:
+            while j + pattern_length <= n_rows and lag_sum[j] - lag_sum[j - pattern_length] == pattern_length:
                 count += 1
                 j += pattern_length
-            patterns.append({'pattern': current_pattern, 'repeats': count})
+            runs.append((i, count))
             i = j
+        
+        # Box the rows of each distinct pattern into tuples in one pass
+        pattern_rows = [k for i, _ in runs for k in range(i, min(i + pattern_length, n_rows))]
+        rows = list(zip(*(values[pattern_rows].tolist() for values in arrays)))
+        patterns = []
+        k = 0
+        for i, count in runs:
+            size = min(pattern_length, n_rows - i)
+            patterns.append({'pattern': tuple(rows[k:k + size]), 'repeats': count})
+            k += size
         compressed_patterns[f'CH{n}'] = patterns
     
     return compressed_patterns
 
+def _pattern_has_pulse(rows):
+    '''True if any (status, time, period, pw) row asks for pulsing
+
+    None, NaN and 0 periods count as no pulse.
+    '''
+    return any(
+        (T is not None and T != 0 and not (isinstance(T, float) and T != T)) or
+        (pw is not None and pw != 0)
+        for _, _, T, pw in rows
+    )
+
 def GeneratePatternCommands(compressed_patterns):
     '''
     Generate string commands from compressed patterns
@@ -2259,55 +2583,39 @@ def GeneratePatternCommands(compressed_patterns):
     for channel_name, patterns in compressed_patterns.items():
         # Extract channel number from the channel name (e.g., 'CH1' -> 1)
         channel_num = int(channel_name.replace('CH', ''))
+        # FindRepeatedPatterns builds every pattern of a channel from the same
+        # columns, so check the format once: (status, time, period, pw) with
+        # pulse info, or the old (status, time)
+        has_pulse_cols = bool(patterns) and len(patterns[0]['pattern'][0]) == 4
+        # Only look for pulsing per pattern if the channel pulses at all
+        channel_pulses = has_pulse_cols and _pattern_has_pulse(
+            row for pattern in patterns for row in pattern['pattern'])
         for i, pattern in enumerate(patterns):
-            # Check if pattern contains pulse info (tuple of 4 elements) or old format (tuple of 2 elements)
-            if len(pattern['pattern'][0]) == 4:
-                # New format with pulse: (status, time, period, pw)
+            if has_pulse_cols:
                 status_values = [str(s) for s, t, T, pw in pattern['pattern']]
                 time_values = [str(t) for s, t, T, pw in pattern['pattern']]
-                period_values = [T for s, t, T, pw in pattern['pattern']]
-                pw_values = [pw for s, t, T, pw in pattern['pattern']]
-                
-                # Check if any non-zero pulse values exist (treat None, NaN, and 0 as no pulse)
-                has_pulse = any(
-                    (T is not None and T != 0 and not (isinstance(T, float) and T != T)) or 
-                    (pw is not None and pw != 0)
-                    for T, pw in zip(period_values, pw_values)
-                )
-                
-                # if the status_values are all 0, time_values are all 0, skip
-                if all([s == '0' for s in status_values]) and all([t == '0' for t in time_values]):
-                    continue
-                
-                # Build pulse string if needed
-                pulse_str = ""
-                if has_pulse:
-                    pulse_parts = []
-                    for period, pw in zip(period_values, pw_values):
-                        # Handle None, NaN, and convert to 0
-                        period_val = 0 if (period is None or (isinstance(period, float) and period != period)) else period
-                        pw_val = 0 if pw is None else pw
-                        pulse_parts.append(f"T{period_val}pw{pw_val}")
-                    pulse_str = f";PULSE:{','.join(pulse_parts)},"
-                
-                # Construct the command string
-                cmd_t = \
-                    f"PATTERN:{i+1};CH:{channel_num};STATUS:{','.join(status_values)};" \
-                    f"TIME_MS:{','.join(time_values)};REPEATS:{pattern['repeats']}{pulse_str}\n"
-                commands.append(cmd_t)
             else:
-                # Old format without pulse: (status, time)
                 status_values = [str(s) for s, t in pattern['pattern']]
                 time_values = [str(t) for s, t in pattern['pattern']]
-                repeats = pattern['repeats']
-                # if the status_values are all 0, time_values are all 0, skip
-                if all([s == '0' for s in status_values]) and all([t == '0' for t in time_values]):
-                    continue
-                # Construct the command string
-                cmd_t = \
-                    f"PATTERN:{i+1};CH:{channel_num};STATUS:{','.join(status_values)};" \
-                    f"TIME_MS:{','.join(time_values)};REPEATS:{repeats}\n"
-                commands.append(cmd_t)
+            
+            # if the status_values are all 0, time_values are all 0, skip
+            if all([s == '0' for s in status_values]) and all([t == '0' for t in time_values]):
+                continue
+            
+            # Build pulse string if needed
+            pulse_str = ""
+            if channel_pulses and _pattern_has_pulse(pattern['pattern']):
+                # Handle None, NaN, and convert to 0; one join per pattern
+                pulse_str = ";PULSE:" + ','.join([
+                    f"T{0 if (period is None or period != period) else period}pw{0 if pw is None else pw}"
+                    for _, _, period, pw in pattern['pattern']
+                ]) + ","
+            
+            # Construct the command string
+            cmd_t = \
+                f"PATTERN:{i+1};CH:{channel_num};STATUS:{','.join(status_values)};" \
+                f"TIME_MS:{','.join(time_values)};REPEATS:{pattern['repeats']}{pulse_str}\n"
+            commands.append(cmd_t)
     return commands
 
 def GenerateWaitCommands(wait_status, remaining_time, valid_channels, wait_pulse=None):
@@ -2456,6 +2764,7 @@ def ReadExcelFile(file_path):
     - Columns with whitespace-only names
     - Columns with only whitespace data
     '''
+    import pandas as pd
     excel_file = pd.ExcelFile(file_path)
     sheet_names = excel_file.sheet_names
     if 'protocol' in sheet_names:
@@ -2508,12 +2817,7 @@ def ReadExcelFile(file_path):
         df_startTime_test = excel_file.parse('start_time', header=0, index_col=None)
         
         # Detect format by checking column names
-        columns_lower = [str(col).lower().replace('_', '').replace(' ', '') for col in df_startTime_test.columns]
-        has_channels_col = any(col == 'channels' for col in columns_lower)
-        has_starttime_col = any(col in ['starttime', 'start'] for col in columns_lower)
-        has_waitstatus_col = any(col in ['waitstatus', 'wait'] for col in columns_lower)
-        
-        if has_channels_col and has_starttime_col and has_waitstatus_col:
+        if len(_start_time_columns_map(df_startTime_test.columns)) == 3:
             # Column-based format: keep all columns
             df_startTime = df_startTime_test
         else:
@@ -2558,6 +2862,7 @@ def ReadTxtFile(file_path):
     - Comments: lines starting with # are ignored
     - Empty lines are ignored
     '''
+    import ast
     with open(file_path, 'r') as f:
         content = f.read()
     
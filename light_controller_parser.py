@@ -167,6 +167,7 @@ class LightControllerParser:
         else:
             # For TXT files, we need to check the raw commands
             # Read the file to check for pulse-related syntax
+            import pandas as pd
             try:
                 with open(self.protocol_file, 'r') as f:
                     content = f.read()
@@ -176,13 +177,11 @@ class LightControllerParser:
                     # Return a simple indicator
                     if has_pulse_syntax:
                         # Create a dummy DataFrame with pulse column to trigger detection
-                        import pandas as pd
                         return pd.DataFrame({'dummy_period': [1]})
                     else:
                         return pd.DataFrame({'dummy': [1]})
             except Exception:
                 # If we can't read, assume no pulses
-                import pandas as pd
                 return pd.DataFrame({'dummy': [1]})
     
     def setup_serial(self, board_type='Arduino', baudrate=9600, verify_pattern_length=True, **kwargs):
@@ -458,7 +457,8 @@ class LightControllerParser:
         channel_units, self.valid_channels = GetChannelInfo(df_protocol)
         self.start_time, self.wait_status = ReadStartTime(df_startTime)
         CheckStartTimeForChannels(self.start_time, self.valid_channels)
-        df_ms = ConvertTimeToMillisecond(df_protocol, channel_units)
+        # df_protocol is not used again, so it can be converted without a copy
+        df_ms = ConvertTimeToMillisecond(df_protocol, channel_units, inplace=True)
         
         # Print channel info
         for ch in self.valid_channels:
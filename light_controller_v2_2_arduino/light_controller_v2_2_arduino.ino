@@ -103,6 +103,9 @@ void setup() {
         }
     }
 
+    //* Tell the host that setup is done so it can stop waiting for initialization
+    Serial.println("READY");
+
     //* Wait for patterns to be received
     bool wait_for_command = true;
     while (wait_for_command) {
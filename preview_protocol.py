@@ -187,7 +187,7 @@ Examples:
                                     if sys.platform == 'darwin':  # macOS
                                         subprocess.run(['open', html_file])
                                     elif sys.platform == 'win32':  # Windows
-                                        subprocess.run(['start', html_file], shell=True)
+                                        os.startfile(html_file)  # no cmd.exe round-trip
                                     else:  # Linux
                                         subprocess.run(['xdg-open', html_file])
                                     
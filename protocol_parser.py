@@ -92,7 +92,7 @@ if __name__ == '__main__':
                                         if sys.platform == 'darwin':  # macOS
                                             subprocess.run(['open', html_file])
                                         elif sys.platform == 'win32':  # Windows
-                                            subprocess.run(['start', html_file], shell=True)
+                                            os.startfile(html_file)  # no cmd.exe round-trip
                                         else:  # Linux
                                             subprocess.run(['xdg-open', html_file])
                                         
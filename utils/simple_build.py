@@ -31,8 +31,9 @@ def main():
     print()
     
     # Basic PyInstaller command
+    # Run PyInstaller from this interpreter instead of resolving it on PATH
     command = [
-        'pyinstaller',
+        sys.executable, '-m', 'PyInstaller',
         '--onefile',
         '--name=LightController',
         '--hidden-import=pandas',